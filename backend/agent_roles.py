@@ -1,14 +1,19 @@
 """Agent role system for intelligent council composition."""
 
+import heapq
 import logging
-from typing import List, Dict, Any, Optional
-from dataclasses import dataclass, asdict
-from .config import COUNCIL_MODELS, FALLBACK_MODELS, MODEL_COSTS, BUDGET_MODELS, PREMIUM_MODELS, MODEL_PRICING
+from functools import lru_cache
+from typing import List, Dict, Any, Optional, Tuple
+from dataclasses import dataclass
+from .config import (
+    COUNCIL_MODELS, FALLBACK_MODELS, MODEL_COSTS, MODEL_FULL_QUERY_COST,
+    BUDGET_MODELS, PREMIUM_MODELS, MODEL_PRICING
+)
 
 logger = logging.getLogger(__name__)
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class AgentRole:
     """Defines a specific role for an agent in the council."""
     name: str
@@ -19,69 +24,80 @@ class AgentRole:
 
     def to_dict(self) -> Dict[str, Any]:
         """Convert to dictionary."""
-        return asdict(self)
+        # Flat fields only, so skip asdict()'s recursive deepcopy
+        return {
+            "name": self.name,
+            "display_name": self.display_name,
+            "description": self.description,
+            "prompt_modifier": self.prompt_modifier,
+            "priority": self.priority,
+        }
+
+
+# Predefined agent roles, built once and shared (roles are never mutated)
+_DEFAULT_ROLES: Tuple[AgentRole, ...] = (
+    AgentRole(
+        name="primary_responder",
+        display_name="Primary Responder",
+        description="Provides the main comprehensive answer with thorough analysis",
+        prompt_modifier="You are the PRIMARY RESPONDER. Provide a comprehensive, well-structured answer that covers all aspects of the question. Be thorough and authoritative.",
+        priority=1
+    ),
+    AgentRole(
+        name="devils_advocate",
+        display_name="Devil's Advocate",
+        description="Challenges assumptions and explores alternative viewpoints",
+        prompt_modifier="You are the DEVIL'S ADVOCATE. Challenge common assumptions, explore counter-arguments, and present alternative perspectives. Question what others might take for granted.",
+        priority=2
+    ),
+    AgentRole(
+        name="fact_checker",
+        display_name="Fact Checker",
+        description="Verifies accuracy and provides evidence-based corrections",
+        prompt_modifier="You are the FACT CHECKER. Verify the accuracy of claims, cite evidence where possible, and point out any factual errors or misconceptions. Focus on precision and reliability.",
+        priority=3
+    ),
+    AgentRole(
+        name="creative_thinker",
+        display_name="Creative Thinker",
+        description="Brings innovative and unconventional perspectives",
+        prompt_modifier="You are the CREATIVE THINKER. Approach the question from unconventional angles, suggest innovative solutions, and think outside the box. Don't be afraid to be bold.",
+        priority=4
+    ),
+    AgentRole(
+        name="practical_advisor",
+        display_name="Practical Advisor",
+        description="Focuses on real-world application and actionable insights",
+        prompt_modifier="You are the PRACTICAL ADVISOR. Focus on real-world applications, concrete examples, and actionable advice. Make your response useful and implementable.",
+        priority=5
+    ),
+    AgentRole(
+        name="domain_expert",
+        display_name="Domain Expert",
+        description="Provides deep specialized knowledge on relevant topics",
+        prompt_modifier="You are the DOMAIN EXPERT. Provide deep, specialized knowledge on this topic. Share technical details, industry best practices, and expert-level insights.",
+        priority=6
+    ),
+    AgentRole(
+        name="synthesizer",
+        display_name="Synthesizer",
+        description="Combines insights from all perspectives into coherent conclusions",
+        prompt_modifier="You are the SYNTHESIZER. Review all other responses, identify common themes, reconcile different viewpoints, and create a unified, balanced conclusion.",
+        priority=7
+    ),
+    AgentRole(
+        name="additional_perspective",
+        display_name="Additional Perspective",
+        description="Provides supplementary viewpoint to enrich the discussion",
+        prompt_modifier="You are an ADDITIONAL PERSPECTIVE. Contribute a unique viewpoint that complements the other responses. Add depth and nuance to the discussion.",
+        priority=8
+    ),
+)
 
 
 def get_default_roles() -> List[AgentRole]:
     """Get predefined agent roles."""
-    return [
-        AgentRole(
-            name="primary_responder",
-            display_name="Primary Responder",
-            description="Provides the main comprehensive answer with thorough analysis",
-            prompt_modifier="You are the PRIMARY RESPONDER. Provide a comprehensive, well-structured answer that covers all aspects of the question. Be thorough and authoritative.",
-            priority=1
-        ),
-        AgentRole(
-            name="devils_advocate",
-            display_name="Devil's Advocate",
-            description="Challenges assumptions and explores alternative viewpoints",
-            prompt_modifier="You are the DEVIL'S ADVOCATE. Challenge common assumptions, explore counter-arguments, and present alternative perspectives. Question what others might take for granted.",
-            priority=2
-        ),
-        AgentRole(
-            name="fact_checker",
-            display_name="Fact Checker",
-            description="Verifies accuracy and provides evidence-based corrections",
-            prompt_modifier="You are the FACT CHECKER. Verify the accuracy of claims, cite evidence where possible, and point out any factual errors or misconceptions. Focus on precision and reliability.",
-            priority=3
-        ),
-        AgentRole(
-            name="creative_thinker",
-            display_name="Creative Thinker",
-            description="Brings innovative and unconventional perspectives",
-            prompt_modifier="You are the CREATIVE THINKER. Approach the question from unconventional angles, suggest innovative solutions, and think outside the box. Don't be afraid to be bold.",
-            priority=4
-        ),
-        AgentRole(
-            name="practical_advisor",
-            display_name="Practical Advisor",
-            description="Focuses on real-world application and actionable insights",
-            prompt_modifier="You are the PRACTICAL ADVISOR. Focus on real-world applications, concrete examples, and actionable advice. Make your response useful and implementable.",
-            priority=5
-        ),
-        AgentRole(
-            name="domain_expert",
-            display_name="Domain Expert",
-            description="Provides deep specialized knowledge on relevant topics",
-            prompt_modifier="You are the DOMAIN EXPERT. Provide deep, specialized knowledge on this topic. Share technical details, industry best practices, and expert-level insights.",
-            priority=6
-        ),
-        AgentRole(
-            name="synthesizer",
-            display_name="Synthesizer",
-            description="Combines insights from all perspectives into coherent conclusions",
-            prompt_modifier="You are the SYNTHESIZER. Review all other responses, identify common themes, reconcile different viewpoints, and create a unified, balanced conclusion.",
-            priority=7
-        ),
-        AgentRole(
-            name="additional_perspective",
-            display_name="Additional Perspective",
-            description="Provides supplementary viewpoint to enrich the discussion",
-            prompt_modifier="You are an ADDITIONAL PERSPECTIVE. Contribute a unique viewpoint that complements the other responses. Add depth and nuance to the discussion.",
-            priority=8
-        ),
-    ]
+    return list(_DEFAULT_ROLES)
 
 
 class RoleAssigner:
@@ -154,6 +170,12 @@ class RoleAssigner:
             },
         }
 
+        # Precompute weighted capability scores once instead of per sort
+        self._capability_scores = {
+            model: self._score_capabilities(caps)
+            for model, caps in self.model_capabilities.items()
+        }
+
     def assign_roles(
         self,
         models: List[str],
@@ -171,48 +193,63 @@ class RoleAssigner:
         Returns:
             List of assignments with model and role
         """
-        roles = custom_roles or self.default_roles.copy()
-        assignments = []
+        # Roles are frozen, so the defaults can be shared without copying
+        roles = custom_roles or self.default_roles
+        role_count = len(roles)
+        capabilities = self.model_capabilities
 
         if smart_matching:
-            # Sort models by capability for primary roles
-            sorted_models = self._sort_by_capability(models)
+            # Rank models by capability for the primary roles only
+            sorted_models = self._sort_by_capability(models, k=role_count)
         else:
             sorted_models = models
 
-        # Assign roles in priority order
-        for i, model in enumerate(sorted_models):
-            if i < len(roles):
-                role = roles[i]
-            else:
-                # Use "additional perspective" for extra models
-                role = AgentRole(
-                    name=f"additional_perspective_{i}",
-                    display_name=f"Additional Perspective {i - len(roles) + 1}",
-                    description="Provides supplementary viewpoint",
-                    prompt_modifier="Provide a unique viewpoint that complements other responses.",
-                    priority=8 + i
-                )
-
-            assignments.append({
+        # Assign roles in priority order; extra models get an "additional perspective"
+        assignments = [
+            {
                 "model": model,
-                "role": role,
-                "capabilities": self.model_capabilities.get(model, {})
-            })
+                "role": roles[i] if i < role_count else _additional_role(i, role_count),
+                "capabilities": capabilities.get(model, {})
+            }
+            for i, model in enumerate(sorted_models)
+        ]
 
         logger.info(f"Assigned {len(assignments)} roles to models")
         return assignments
 
-    def _sort_by_capability(self, models: List[str]) -> List[str]:
-        """Sort models by their capabilities (best first)."""
-        def score_model(model: str) -> float:
-            caps = self.model_capabilities.get(model, {"reasoning": 0.5})
-            # Weighted score: reasoning most important for primary role
-            return caps.get("reasoning", 0.5) * 0.5 + \
-                   caps.get("accuracy", 0.5) * 0.3 + \
-                   caps.get("creativity", 0.5) * 0.2
+    @staticmethod
+    def _score_capabilities(caps: Dict[str, float]) -> float:
+        """Weighted score: reasoning most important for primary role."""
+        return caps.get("reasoning", 0.5) * 0.5 + \
+               caps.get("accuracy", 0.5) * 0.3 + \
+               caps.get("creativity", 0.5) * 0.2
+
+    def _sort_by_capability(self, models: List[str], k: Optional[int] = None) -> List[str]:
+        """
+        Sort models by their capabilities (best first).
+
+        Args:
+            models: Model identifiers
+            k: If given, only the top k models are ranked; the rest follow
+               in their original order
+
+        Returns:
+            Reordered list of models
+        """
+        scores = self._capability_scores
+
+        # Unknown models score 0.5 (all capabilities default to 0.5)
+        def score(i: int) -> float:
+            return scores.get(models[i], 0.5)
+
+        if k is None or k >= len(models):
+            order = sorted(range(len(models)), key=score, reverse=True)
+        else:
+            top = heapq.nlargest(k, range(len(models)), key=score)
+            ranked = set(top)
+            order = top + [i for i in range(len(models)) if i not in ranked]
 
-        return sorted(models, key=score_model, reverse=True)
+        return [models[i] for i in order]
 
 
 class CouncilComposer:
@@ -299,8 +336,8 @@ class CouncilComposer:
             model = available[0]
 
         # Assign appropriate role
-        existing_roles = [a["role"].name for a in council["agents"]]
-        available_roles = [r for r in get_default_roles()
+        existing_roles = {a["role"].name for a in council["agents"]}
+        available_roles = [r for r in _DEFAULT_ROLES
                           if r.name not in existing_roles]
 
         if available_roles:
@@ -352,7 +389,8 @@ class CouncilComposer:
 
         removed = council["agents"].pop(agent_index)
         council["agent_count"] = len(council["agents"])
-        council["roles_summary"] = [a["role"].display_name for a in council["agents"]]
+        # Keep the summary in step with agents without rebuilding it
+        del council["roles_summary"][agent_index]
 
         logger.info(f"Removed agent: {removed['model']}")
 
@@ -364,29 +402,12 @@ class CouncilComposer:
         mode: str
     ) -> List[str]:
         """Select models based on count and mode."""
-        if mode == "budget":
-            pool = BUDGET_MODELS
-        elif mode == "premium":
-            pool = PREMIUM_MODELS
-        else:  # balanced
-            pool = COUNCIL_MODELS
-
-        # Select requested number, cycling if needed
-        selected = []
-        for i in range(count):
-            selected.append(pool[i % len(pool)])
-        return selected
+        return list(_select_models_for_mode_impl(count, mode))
 
     def _estimate_cost(self, models: List[str]) -> float:
-        """Estimate cost for a set of models."""
-        total = 0.0
-        for model in models:
-            # Assume average query uses 2000 tokens
-            cost_per_k = MODEL_COSTS.get(model, 0.001)
-            total += (2000 / 1000) * cost_per_k
-
-        # Multiply by 3 for all stages
-        return round(total * 3, 2)
+        """Estimate cost for a set of models (2000 tokens x 3 stages each)."""
+        # Unknown models default to $0.001 per 1K tokens
+        return round(sum(MODEL_FULL_QUERY_COST.get(m, 0.006) for m in models), 2)
 
     def _determine_topology(self, agent_count: int) -> str:
         """Determine optimal topology based on agent count."""
@@ -398,10 +419,35 @@ class CouncilComposer:
             return "mesh"  # Full peer-to-peer
 
 
+@lru_cache(maxsize=64)
+def _additional_role(index: int, role_count: int) -> AgentRole:
+    """Shared "additional perspective" role for the model at position index."""
+    return AgentRole(
+        name=f"additional_perspective_{index}",
+        display_name=f"Additional Perspective {index - role_count + 1}",
+        description="Provides supplementary viewpoint",
+        prompt_modifier="Provide a unique viewpoint that complements other responses.",
+        priority=8 + index
+    )
+
+
+@lru_cache(maxsize=32)
+def _select_models_for_mode_impl(count: int, mode: str) -> Tuple[str, ...]:
+    """Cached model selection; pools are module constants so output is invariant."""
+    if mode == "budget":
+        pool = BUDGET_MODELS
+    elif mode == "premium":
+        pool = PREMIUM_MODELS
+    else:  # balanced
+        pool = COUNCIL_MODELS
+
+    # Select requested number, cycling if needed
+    return tuple(pool[i % len(pool)] for i in range(count))
+
+
 def assign_role_to_model(model: str, role_name: str) -> Dict[str, Any]:
     """Helper to assign a specific role to a model."""
-    roles = get_default_roles()
-    role = next((r for r in roles if r.name == role_name), None)
+    role = next((r for r in _DEFAULT_ROLES if r.name == role_name), None)
 
     if not role:
         raise ValueError(f"Unknown role: {role_name}")
@@ -412,8 +458,13 @@ def assign_role_to_model(model: str, role_name: str) -> Dict[str, Any]:
     }
 
 
-def get_available_models() -> Dict[str, List[str]]:
-    """Get available models grouped by tier (premium, standard, budget)."""
+@lru_cache(maxsize=1)
+def get_available_models() -> Dict[str, Tuple[str, ...]]:
+    """
+    Get available models grouped by tier (premium, standard, budget).
+
+    The result is cached and shared between callers, so tiers are tuples.
+    """
     all_models = list(set(COUNCIL_MODELS + FALLBACK_MODELS))
 
     # Categorize by cost
@@ -431,7 +482,7 @@ def get_available_models() -> Dict[str, List[str]]:
             budget.append(model)
 
     return {
-        "premium": sorted(premium),
-        "standard": sorted(standard),
-        "budget": sorted(budget)
+        "premium": tuple(sorted(premium)),
+        "standard": tuple(sorted(standard)),
+        "budget": tuple(sorted(budget))
     }
\ No newline at end of file
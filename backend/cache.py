@@ -1,70 +1,300 @@
 """Caching layer for reducing API costs."""
 
+import asyncio
 import hashlib
-import json
 import logging
-from typing import Optional, Dict, Any, List
-from datetime import datetime, timedelta
-from .config import DEFAULT_CACHE_TTL
+import math
+import threading
+import time
+from collections import deque
+from itertools import chain
+from typing import Optional, Dict, Any, Deque, Iterable, List, Callable, Tuple
+from datetime import datetime
+import msgpack
+import orjson
+from cachetools import TTLCache
+from .config import (
+    DEFAULT_CACHE_TTL, MEMORY_CACHE_MAX_ENTRIES, BLOOM_REBUILD_INTERVAL,
+    SEMANTIC_CACHE_MODEL, SEMANTIC_CACHE_THRESHOLD, SEMANTIC_CACHE_MAX_ENTRIES
+)
 
 logger = logging.getLogger(__name__)
 
 # Try to import Redis, fall back to in-memory cache if not available
 try:
-    import redis
+    from redis.asyncio import Redis, ConnectionPool
     REDIS_AVAILABLE = True
 except ImportError:
     REDIS_AVAILABLE = False
     logger.warning("Redis not available, using in-memory cache")
 
+# Prefer BLAKE3 for cache keys, fall back to BLAKE2b from the stdlib
+try:
+    from blake3 import blake3 as _new_hash
+except ImportError:
+    def _new_hash() -> Any:
+        return hashlib.blake2b(digest_size=32)
+
+# Optional semantic cache dependencies
+try:
+    from sentence_transformers import SentenceTransformer
+    EMBEDDINGS_AVAILABLE = True
+except ImportError:
+    EMBEDDINGS_AVAILABLE = False
+
+try:
+    import faiss
+    import numpy as np
+    FAISS_AVAILABLE = True
+except ImportError:
+    FAISS_AVAILABLE = False
+
+
+class KeyBloomFilter:
+    """
+    Fixed-size Bloom filter over cache keys.
+
+    Answers "definitely absent" or "possibly present", letting the Redis
+    path skip a network round trip for keys that were never written.
+    With 7 hashes the false-positive rate stays around 1% up to one key per
+    10 bits (~100k keys for the default 2**20 bits); past that the filter
+    reports itself saturated.
+    """
+
+    def __init__(self, num_bits: int = 1 << 20, num_hashes: int = 7) -> None:
+        """
+        Initialize an empty filter.
+
+        Args:
+            num_bits: Filter size in bits (power of two)
+            num_hashes: Number of bit positions per key
+        """
+        self.num_bits = num_bits
+        self.num_hashes = num_hashes
+        self._mask = num_bits - 1
+        self._shift = num_bits.bit_length() - 1
+        self._digest_size = -(-num_hashes * self._shift // 8)
+        self._bits = bytearray(num_bits // 8)
+        self.count = 0
+
+    @classmethod
+    def for_keys(cls, expected_keys: int) -> "KeyBloomFilter":
+        """Create a filter sized for expected_keys at about 1% false positives."""
+        num_bits = 1 << 20
+        while num_bits < expected_keys * 10:
+            num_bits <<= 1
+        return cls(num_bits)
+
+    @property
+    def saturated(self) -> bool:
+        """True once more keys were added than the filter is sized for."""
+        return self.count * 10 > self.num_bits
+
+    def _positions(self, key: str) -> List[int]:
+        """Derive bit positions from one wide digest of the key."""
+        digest = int.from_bytes(
+            hashlib.blake2b(key.encode(), digest_size=self._digest_size).digest(),
+            "big"
+        )
+        positions = []
+        for _ in range(self.num_hashes):
+            positions.append(digest & self._mask)
+            digest >>= self._shift
+        return positions
+
+    def add(self, key: str) -> None:
+        """Record a key as present."""
+        bits = self._bits
+        for pos in self._positions(key):
+            bits[pos >> 3] |= 1 << (pos & 7)
+        self.count += 1
+
+    def __contains__(self, key: str) -> bool:
+        bits = self._bits
+        return all(bits[pos >> 3] & (1 << (pos & 7)) for pos in self._positions(key))
+
 
 class ResponseCache:
     """Cache for LLM responses to reduce API costs."""
 
-    def __init__(self, redis_url: str = "redis://localhost:6379", ttl: int = DEFAULT_CACHE_TTL):
+    def __init__(
+        self,
+        redis_url: str = "redis://localhost:6379",
+        ttl: int = DEFAULT_CACHE_TTL,
+        max_connections: int = 64
+    ) -> None:
         """
         Initialize cache with Redis or in-memory fallback.
 
+        The Redis connection is verified lazily on first use (see connect()).
+
         Args:
             redis_url: Redis connection URL
             ttl: Time-to-live for cache entries in seconds
+            max_connections: Size of the shared Redis connection pool
         """
         self.ttl = ttl
-        self.stats = {"hits": 0, "misses": 0, "saves": 0}
+        self.stats: Dict[str, int] = {"hits": 0, "misses": 0, "saves": 0}
+        # Bounded in-memory cache of MessagePack blobs (one compact bytes object per
+        # entry instead of nested dicts); expiry uses monotonic time
+        self.memory_cache = TTLCache(maxsize=MEMORY_CACHE_MAX_ENTRIES, ttl=ttl, timer=time.monotonic)
+
+        self._connected = False
+        # Keys written to Redis, rebuilt from a SCAN when the connection is
+        # verified and again every BLOOM_REBUILD_INTERVAL (see _bloom_gate)
+        self._bloom: Optional[KeyBloomFilter] = None
+        self._bloom_built_at = 0.0
+        self._bloom_attempted_at = 0.0
+        self._bloom_task: Optional[asyncio.Task] = None
+        # Keys this process writes while a rebuild is scanning
+        self._bloom_added: Optional[List[str]] = None
 
         if REDIS_AVAILABLE:
             try:
-                self.redis_client = redis.from_url(redis_url, decode_responses=True)
-                self.redis_client.ping()
+                # Bytes mode: values are stored as MessagePack
+                self._pool = ConnectionPool.from_url(
+                    redis_url,
+                    max_connections=max_connections
+                )
+                self.redis_client = Redis(connection_pool=self._pool)
                 self.use_redis = True
-                logger.info("Using Redis cache")
-            except (redis.ConnectionError, Exception) as e:
-                logger.warning(f"Redis connection failed: {e}, using in-memory cache")
+            except Exception as e:
+                logger.warning(f"Redis setup failed: {e}, using in-memory cache")
                 self.use_redis = False
-                self.memory_cache = {}
         else:
             self.use_redis = False
-            self.memory_cache = {}
             logger.info("Using in-memory cache")
 
-    def get_cache_key(self, model: str, messages: List[Dict[str, str]]) -> str:
+    async def connect(self) -> bool:
+        """
+        Verify the Redis connection, falling back to memory if unreachable.
+
+        Returns:
+            True if Redis is in use
+        """
+        if self.use_redis and not self._connected:
+            try:
+                await self.redis_client.ping()
+                self._connected = True
+                logger.info("Using Redis cache")
+            except Exception as e:
+                logger.warning(f"Redis connection failed: {e}, using in-memory cache")
+                self.use_redis = False
+            else:
+                await self._rebuild_bloom()
+        return self.use_redis
+
+    async def _rebuild_bloom(self) -> None:
+        """
+        Replace the Bloom filter with one built from the keys now in Redis.
+
+        Expired keys drop out and keys written by other processes are picked
+        up; the new filter is sized for twice the live keys. If the scan
+        fails the filter is disabled until the next attempt.
+        """
+        started = self._bloom_attempted_at = time.monotonic()
+        self._bloom_added = added = []
+        keys = []
+        try:
+            for pattern in ("council:response:*", "council:complete:*"):
+                async for key in self.redis_client.scan_iter(match=pattern, count=1000):
+                    keys.append(key.decode() if isinstance(key, bytes) else key)
+        except Exception as e:
+            logger.warning(f"Bloom filter rebuild failed: {e}, checking Redis on every get")
+            self._bloom = None
+            return
+        finally:
+            self._bloom_added = None
+        bloom = KeyBloomFilter.for_keys(2 * (len(keys) + len(added)))
+        for key in chain(keys, added):
+            bloom.add(key)
+        self._bloom, self._bloom_built_at = bloom, started
+
+    def _bloom_gate(self) -> Optional[KeyBloomFilter]:
+        """
+        The filter to skip Redis reads with, or None to ask Redis directly.
+
+        Other processes' writes only reach the filter through a rebuild, so
+        it is trusted for BLOOM_REBUILD_INTERVAL after its scan and while it
+        is not saturated; once due, a rebuild runs in the background.
+        """
+        now = time.monotonic()
+        if self._bloom_task is None and now - self._bloom_attempted_at >= BLOOM_REBUILD_INTERVAL:
+            self._bloom_task = asyncio.create_task(self._rebuild_bloom())
+            self._bloom_task.add_done_callback(self._bloom_rebuilt)
+        bloom = self._bloom
+        if bloom is None or bloom.saturated or now - self._bloom_built_at >= BLOOM_REBUILD_INTERVAL:
+            return None
+        return bloom
+
+    def _bloom_rebuilt(self, task: asyncio.Task) -> None:
+        """Allow the next rebuild once this one has finished."""
+        self._bloom_task = None
+
+    def _bloom_add(self, keys: Iterable[str]) -> None:
+        """Record keys this process wrote to Redis."""
+        bloom, added = self._bloom, self._bloom_added
+        for key in keys:
+            if bloom is not None:
+                bloom.add(key)
+            if added is not None:
+                added.append(key)
+
+    def fingerprint(self, messages: List[Dict[str, str]]) -> str:
+        """
+        Hash a message list once so it can be shared across models.
+
+        Args:
+            messages: Chat messages
+
+        Returns:
+            BLAKE3 (or BLAKE2b) hex digest of the messages
+        """
+        # Stream a canonical binary encoding into the hash instead of
+        # serializing the whole structure to JSON first
+        h = _new_hash()
+        update = h.update
+        for message in messages:
+            update(message["role"].encode())
+            update(b"\x01")
+            update(message["content"].encode())
+            update(b"\x02")
+        return h.hexdigest()
+
+    def get_cache_key(
+        self,
+        model: str,
+        messages: List[Dict[str, str]],
+        fingerprint: Optional[str] = None
+    ) -> str:
         """
         Generate a unique cache key for model + messages.
 
         Args:
             model: Model identifier
             messages: Chat messages
+            fingerprint: Precomputed fingerprint(messages), if available
 
         Returns:
-            SHA256 hash as cache key
+            BLAKE3 (or BLAKE2b) hash as cache key
         """
-        # Create a deterministic string representation
-        content = json.dumps(
-            {"model": model, "messages": messages},
-            sort_keys=True,
-            separators=(',', ':')
-        )
-        return f"council:response:{hashlib.sha256(content.encode()).hexdigest()}"
+        h = _new_hash()
+        h.update(model.encode())
+        h.update(b"\x00")
+        h.update((fingerprint or self.fingerprint(messages)).encode())
+        # "v2" marks MessagePack values so legacy JSON entries are never decoded
+        return f"council:response:v2:{h.hexdigest()}"
+
+    def cache_keys(self, pairs: Iterable[Tuple[str, List[Dict[str, str]]]]) -> List[str]:
+        """Cache keys for (model, messages) pairs, hashing each message list once."""
+        fingerprints: Dict[int, str] = {}
+        keys = []
+        for model, messages in pairs:
+            fp = fingerprints.get(id(messages))
+            if fp is None:
+                fp = fingerprints[id(messages)] = self.fingerprint(messages)
+            keys.append(self.get_cache_key(model, messages, fp))
+        return keys
 
     async def get(self, model: str, messages: List[Dict[str, str]]) -> Optional[Dict[str, Any]]:
         """
@@ -77,32 +307,49 @@ class ResponseCache:
         Returns:
             Cached response or None
         """
-        key = self.get_cache_key(model, messages)
+        return await self.get_by_raw_key(self.get_cache_key(model, messages))
+
+    async def get_by_raw_key(self, key: str) -> Optional[Dict[str, Any]]:
+        """
+        Get a cached entry by a precomputed key.
+
+        Args:
+            key: Full cache key
+
+        Returns:
+            Cached response or None
+        """
+        cached = await self._read(key)
+
+        if cached is not None:
+            self.stats["hits"] += 1
+            logger.debug(f"Cache hit for {key}")
+            return cached
+
+        self.stats["misses"] += 1
+        logger.debug(f"Cache miss for {key}")
+        return None
 
+    async def _read(self, key: str) -> Optional[Dict[str, Any]]:
+        """Read an entry by cache key without touching statistics."""
         try:
-            if self.use_redis:
-                cached = self.redis_client.get(key)
+            if await self.connect():
+                # Definite miss: skip the round trip
+                bloom = self._bloom_gate()
+                if bloom is not None and key not in bloom:
+                    return None
+                cached = await self.redis_client.get(key)
                 if cached:
-                    self.stats["hits"] += 1
-                    logger.debug(f"Cache hit for {model}")
-                    return json.loads(cached)
+                    return msgpack.unpackb(cached, raw=False)
             else:
-                # In-memory cache with expiry checking
-                if key in self.memory_cache:
-                    entry = self.memory_cache[key]
-                    if datetime.now() < entry["expiry"]:
-                        self.stats["hits"] += 1
-                        logger.debug(f"Cache hit for {model}")
-                        return entry["data"]
-                    else:
-                        # Expired, remove it
-                        del self.memory_cache[key]
+                # TTLCache drops expired entries on access
+                cached = self.memory_cache.get(key)
+                if cached is not None:
+                    return msgpack.unpackb(cached, raw=False)
 
         except Exception as e:
             logger.error(f"Cache get error: {e}")
 
-        self.stats["misses"] += 1
-        logger.debug(f"Cache miss for {model}")
         return None
 
     async def set(
@@ -122,43 +369,147 @@ class ResponseCache:
         Returns:
             True if successfully cached
         """
-        key = self.get_cache_key(model, messages)
+        return await self.set_by_raw_key(self.get_cache_key(model, messages), response)
 
+    async def set_by_raw_key(self, key: str, response: Dict[str, Any]) -> bool:
+        """
+        Cache an entry under a precomputed key.
+
+        Args:
+            key: Full cache key
+            response: Response to cache
+
+        Returns:
+            True if successfully cached
+        """
         try:
-            if self.use_redis:
-                self.redis_client.setex(
+            if await self.connect():
+                await self.redis_client.setex(
                     key,
                     self.ttl,
-                    json.dumps(response)
+                    msgpack.packb(response, use_bin_type=True)
                 )
+                self._bloom_add((key,))
             else:
-                # In-memory cache with expiry
-                self.memory_cache[key] = {
-                    "data": response,
-                    "expiry": datetime.now() + timedelta(seconds=self.ttl)
-                }
+                self.memory_cache[key] = msgpack.packb(response, use_bin_type=True)
 
             self.stats["saves"] += 1
-            logger.debug(f"Cached response for {model}")
+            logger.debug(f"Cached response for {key}")
             return True
 
         except Exception as e:
             logger.error(f"Cache set error: {e}")
             return False
 
-    async def clear_expired(self):
+    async def mget(
+        self,
+        requests: List[Tuple[str, List[Dict[str, str]]]]
+    ) -> List[Optional[Dict[str, Any]]]:
+        """
+        Get cached responses for several (model, messages) pairs at once.
+
+        With Redis all lookups go out in a single pipelined round trip.
+
+        Args:
+            requests: List of (model, messages) pairs
+
+        Returns:
+            Cached response or None for each request, in order
+        """
+        return await self.mget_by_raw_keys(self.cache_keys(requests))
+
+    async def mget_by_raw_keys(
+        self,
+        keys: List[str],
+        record_stats: bool = True
+    ) -> List[Optional[Dict[str, Any]]]:
+        """
+        Get cached entries for several precomputed keys at once.
+
+        With Redis all lookups go out in a single pipelined round trip.
+
+        Args:
+            keys: Full cache keys
+            record_stats: Whether to count the lookups as hits and misses
+
+        Returns:
+            Cached entry or None for each key, in order
+        """
+        results: List[Optional[Dict[str, Any]]] = [None] * len(keys)
+
+        try:
+            if await self.connect():
+                bloom = self._bloom_gate()
+                # Only keys that may exist go over the wire
+                pending = [i for i, key in enumerate(keys) if bloom is None or key in bloom]
+                if pending:
+                    async with self.redis_client.pipeline(transaction=False) as pipe:
+                        for i in pending:
+                            pipe.get(keys[i])
+                        raw = await pipe.execute()
+                    for i, r in zip(pending, raw):
+                        if r:
+                            results[i] = msgpack.unpackb(r, raw=False)
+            else:
+                for i, key in enumerate(keys):
+                    cached = self.memory_cache.get(key)
+                    if cached is not None:
+                        results[i] = msgpack.unpackb(cached, raw=False)
+        except Exception as e:
+            logger.error(f"Cache mget error: {e}")
+
+        if not record_stats:
+            return results
+        hits = sum(1 for r in results if r is not None)
+        self.stats["hits"] += hits
+        self.stats["misses"] += len(results) - hits
+        logger.debug(f"Cache mget: {hits}/{len(results)} hits")
+        return results
+
+    async def mset(
+        self,
+        items: List[Tuple[str, List[Dict[str, str]], Dict[str, Any]]]
+    ) -> bool:
+        """
+        Cache several responses at once.
+
+        Args:
+            items: List of (model, messages, response) tuples
+
+        Returns:
+            True if successfully cached
+        """
+        if not items:
+            return True
+
+        keys = self.cache_keys((model, messages) for model, messages, _ in items)
+
+        try:
+            if await self.connect():
+                async with self.redis_client.pipeline(transaction=False) as pipe:
+                    for key, (_, _, response) in zip(keys, items):
+                        pipe.setex(key, self.ttl, msgpack.packb(response, use_bin_type=True))
+                    await pipe.execute()
+                self._bloom_add(keys)
+            else:
+                for key, (_, _, response) in zip(keys, items):
+                    self.memory_cache[key] = msgpack.packb(response, use_bin_type=True)
+
+            self.stats["saves"] += len(items)
+            logger.debug(f"Cached {len(items)} responses")
+            return True
+
+        except Exception as e:
+            logger.error(f"Cache mset error: {e}")
+            return False
+
+    async def clear_expired(self) -> None:
         """Clear expired entries (for in-memory cache)."""
         if not self.use_redis:
-            now = datetime.now()
-            expired_keys = [
-                k for k, v in self.memory_cache.items()
-                if now >= v["expiry"]
-            ]
-            for key in expired_keys:
-                del self.memory_cache[key]
+            expired = self.memory_cache.expire()
 
-            if expired_keys:
-                logger.info(f"Cleared {len(expired_keys)} expired cache entries")
+            if expired:
+                logger.info(f"Cleared {len(expired)} expired cache entries")
 
     def get_stats(self) -> Dict[str, Any]:
         """Get cache statistics."""
@@ -174,10 +525,330 @@ class ResponseCache:
         }
 
 
+class SemanticCache:
+    """
+    Semantic layer over ResponseCache that serves near-duplicate prompts.
+
+    User messages are embedded and searched against previously cached prompts
+    of the same model and system/assistant context; a hit above the similarity
+    threshold returns the stored response. Embedding and search run in worker
+    threads so they never block the event loop. Without an embedding backend
+    this is a transparent passthrough.
+    """
+
+    INDEX_PREFIX = "council:semantic:"
+
+    def __init__(
+        self,
+        cache: ResponseCache,
+        threshold: float = SEMANTIC_CACHE_THRESHOLD,
+        embedder: Optional[Callable[[str], List[float]]] = None,
+        model_name: str = SEMANTIC_CACHE_MODEL,
+        max_entries: int = SEMANTIC_CACHE_MAX_ENTRIES
+    ) -> None:
+        """
+        Initialize semantic cache.
+
+        Args:
+            cache: Underlying exact-match response cache
+            threshold: Minimum cosine similarity to count as a hit
+            embedder: Optional text -> vector function (defaults to sentence-transformers)
+            model_name: Sentence-transformers model used when no embedder is given
+            max_entries: Indexed prompts kept per partition; the oldest are evicted first
+        """
+        self.cache = cache
+        self.threshold = threshold
+        self.model_name = model_name
+        self.max_entries = max_entries
+        self._embedder = embedder
+        self.enabled = embedder is not None or EMBEDDINGS_AVAILABLE
+        self.semantic_hits = 0
+
+        # One index per partition (model + non-user context) so different models
+        # or system prompts never collide. Each partition keeps (vector, key)
+        # entries oldest first; with FAISS a parallel IndexFlatIP mirrors them.
+        self._entries: Dict[str, Deque[Tuple[List[float], str]]] = {}
+        self._faiss: Dict[str, Any] = {}
+        # Indexes are read and written from worker threads
+        self._lock = threading.Lock()
+
+        # Redis-persisted entries are loaded on first use
+        self._index_loaded = False
+
+        if not self.enabled:
+            logger.info("Embeddings not available, semantic cache disabled")
+
+    def __getattr__(self, name: str) -> Any:
+        # Delegate everything else (get_cache_key, get_by_raw_key, ...) to the wrapped cache
+        if name == "cache":
+            raise AttributeError(name)
+        return getattr(self.cache, name)
+
+    def _partition(self, model: str, messages: List[Dict[str, str]]) -> str:
+        """Index partition for a request: the model plus a hash of its non-user messages."""
+        context = [m for m in messages if m.get("role") != "user"]
+        if not context:
+            return model
+        return f"{model}:{self.cache.fingerprint(context)[:16]}"
+
+    def _embed(self, messages: List[Dict[str, str]]) -> List[float]:
+        """Embed the concatenated user messages as a unit-length vector (blocking)."""
+        with self._lock:
+            if self._embedder is None:
+                encoder = SentenceTransformer(self.model_name)
+                self._embedder = lambda text: encoder.encode(text).tolist()
+            embedder = self._embedder
+
+        text = "\n".join(m["content"] for m in messages if m.get("role") == "user")
+        vector = [float(x) for x in embedder(text)]
+        norm = math.sqrt(sum(x * x for x in vector)) or 1.0
+        return [x / norm for x in vector]
+
+    def _add(self, partition: str, vector: List[float], key: str) -> None:
+        """Add a prompt vector to a partition, evicting the oldest past max_entries."""
+        with self._lock:
+            entries = self._entries.setdefault(partition, deque())
+            entries.append((vector, key))
+            if FAISS_AVAILABLE:
+                if partition not in self._faiss:
+                    self._faiss[partition] = faiss.IndexFlatIP(len(vector))
+                self._faiss[partition].add(np.array([vector], dtype=np.float32))
+            while len(entries) > self.max_entries:
+                entries.popleft()
+                if FAISS_AVAILABLE:
+                    # Flat indexes renumber on removal, staying aligned with the deque
+                    self._faiss[partition].remove_ids(np.array([0], dtype=np.int64))
+
+    def _search(self, partition: str, vector: List[float]) -> Optional[Tuple[float, str]]:
+        """Find the most similar cached prompt in a partition."""
+        with self._lock:
+            entries = self._entries.get(partition)
+            if not entries:
+                return None
+
+            if FAISS_AVAILABLE:
+                scores, ids = self._faiss[partition].search(np.array([vector], dtype=np.float32), 1)
+                if ids[0][0] < 0:
+                    return None
+                return float(scores[0][0]), entries[ids[0][0]][1]
+
+            best_score, best_key = -1.0, None
+            for stored, key in entries:
+                score = sum(a * b for a, b in zip(vector, stored))
+                if score > best_score:
+                    best_score, best_key = score, key
+            return best_score, best_key
+
+    def _lookup_many(
+        self,
+        requests: List[Tuple[str, List[Dict[str, str]]]]
+    ) -> List[Optional[Tuple[float, str]]]:
+        """Best match per (model, messages) pair, embedding each message list once (blocking)."""
+        vectors: Dict[int, List[float]] = {}
+        matches = []
+        for model, messages in requests:
+            vector = vectors.get(id(messages))
+            if vector is None:
+                vector = vectors[id(messages)] = self._embed(messages)
+            matches.append(self._search(self._partition(model, messages), vector))
+        return matches
+
+    def _add_many(
+        self,
+        items: List[Tuple[str, List[Dict[str, str]], str]]
+    ) -> List[Tuple[str, List[float], str]]:
+        """Index (model, messages, key) items, embedding each message list once (blocking)."""
+        vectors: Dict[int, List[float]] = {}
+        added = []
+        for model, messages, key in items:
+            vector = vectors.get(id(messages))
+            if vector is None:
+                vector = vectors[id(messages)] = self._embed(messages)
+            partition = self._partition(model, messages)
+            self._add(partition, vector, key)
+            added.append((partition, vector, key))
+        return added
+
+    async def _load_index(self) -> None:
+        """Rebuild in-process indexes from entries persisted in Redis."""
+        if self._index_loaded:
+            return
+        self._index_loaded = True
+
+        if not await self.cache.connect():
+            return
+
+        try:
+            async for index_key in self.cache.redis_client.scan_iter(match=f"{self.INDEX_PREFIX}*"):
+                partition = index_key.decode()[len(self.INDEX_PREFIX):]
+                for raw in await self.cache.redis_client.lrange(index_key, -self.max_entries, -1):
+                    entry = orjson.loads(raw)
+                    self._add(partition, entry["embedding"], entry["key"])
+            logger.info(f"Loaded semantic index for {len(self._entries)} partitions")
+        except Exception as e:
+            logger.error(f"Semantic index load error: {e}")
+
+    async def _persist(self, partition: str, vector: List[float], key: str) -> None:
+        """Persist an index entry to Redis so it survives restarts, keeping the newest max_entries."""
+        index_key = f"{self.INDEX_PREFIX}{partition}"
+        try:
+            async with self.cache.redis_client.pipeline(transaction=False) as pipe:
+                pipe.rpush(index_key, orjson.dumps({"key": key, "embedding": vector}))
+                pipe.ltrim(index_key, -self.max_entries, -1)
+                pipe.expire(index_key, self.cache.ttl)
+                await pipe.execute()
+        except Exception as e:
+            logger.error(f"Semantic index persist error: {e}")
+
+    async def _index(self, items: List[Tuple[str, List[Dict[str, str]], str]]) -> None:
+        """Embed and index freshly cached prompts off the event loop."""
+        try:
+            added = await asyncio.to_thread(self._add_many, items)
+        except Exception as e:
+            logger.error(f"Semantic cache index error: {e}")
+            return
+        if self.cache.use_redis:
+            for partition, vector, key in added:
+                await self._persist(partition, vector, key)
+
+    async def _semantic_read(
+        self,
+        requests: List[Tuple[str, List[Dict[str, str]]]]
+    ) -> List[Optional[Dict[str, Any]]]:
+        """Cached responses for the closest prompts above the threshold (None where there is none)."""
+        try:
+            matches = await asyncio.to_thread(self._lookup_many, requests)
+        except Exception as e:
+            logger.error(f"Semantic cache search error: {e}")
+            return [None] * len(requests)
+
+        results: List[Optional[Dict[str, Any]]] = [None] * len(requests)
+        # Entries for every close-enough match are fetched in one batch
+        matched = [i for i, match in enumerate(matches) if match and match[0] >= self.threshold]
+        if not matched:
+            return results
+        cached_list = await self.cache.mget_by_raw_keys(
+            [matches[i][1] for i in matched], record_stats=False
+        )
+        for i, cached in zip(matched, cached_list):
+            if cached is not None:
+                results[i] = cached
+                self.semantic_hits += 1
+                logger.debug(f"Semantic cache hit for {requests[i][0]} "
+                             f"(similarity {matches[i][0]:.3f})")
+        return results
+
+    async def get(self, model: str, messages: List[Dict[str, str]]) -> Optional[Dict[str, Any]]:
+        """
+        Get cached response for the exact or a semantically similar prompt.
+
+        Args:
+            model: Model identifier
+            messages: Chat messages
+
+        Returns:
+            Cached response or None
+        """
+        return (await self.mget([(model, messages)]))[0]
+
+    async def mget(
+        self,
+        requests: List[Tuple[str, List[Dict[str, str]]]]
+    ) -> List[Optional[Dict[str, Any]]]:
+        """
+        Get cached responses for several (model, messages) pairs at once.
+
+        Exact matches come from one batched lookup; only the misses are embedded
+        and searched.
+
+        Args:
+            requests: List of (model, messages) pairs
+
+        Returns:
+            Cached response or None for each request, in order
+        """
+        results = await self.cache.mget(requests)
+        if not self.enabled:
+            return results
+
+        await self._load_index()
+
+        missing = [i for i, cached in enumerate(results) if cached is None]
+        if missing:
+            similar = await self._semantic_read([requests[i] for i in missing])
+            for i, cached in zip(missing, similar):
+                if cached is not None:
+                    results[i] = cached
+                    # The exact lookup counted this as a miss
+                    self.cache.stats["hits"] += 1
+                    self.cache.stats["misses"] -= 1
+        return results
+
+    async def set(
+        self,
+        model: str,
+        messages: List[Dict[str, str]],
+        response: Dict[str, Any]
+    ) -> bool:
+        """
+        Cache a response and index its prompt for similarity lookups.
+
+        Args:
+            model: Model identifier
+            messages: Chat messages
+            response: Response to cache
+
+        Returns:
+            True if successfully cached
+        """
+        if self.enabled:
+            await self._load_index()
+
+        saved = await self.cache.set(model, messages, response)
+
+        if saved and self.enabled:
+            await self._index([(model, messages, self.cache.get_cache_key(model, messages))])
+
+        return saved
+
+    async def mset(
+        self,
+        items: List[Tuple[str, List[Dict[str, str]], Dict[str, Any]]]
+    ) -> bool:
+        """
+        Cache several responses at once and index their prompts.
+
+        Args:
+            items: List of (model, messages, response) tuples
+
+        Returns:
+            True if successfully cached
+        """
+        if self.enabled:
+            await self._load_index()
+
+        saved = await self.cache.mset(items)
+
+        if saved and self.enabled and items:
+            keys = self.cache.cache_keys((model, messages) for model, messages, _ in items)
+            await self._index([
+                (model, messages, key) for (model, messages, _), key in zip(items, keys)
+            ])
+
+        return saved
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get cache statistics including semantic hits."""
+        stats = self.cache.get_stats()
+        stats["semantic_hits"] = self.semantic_hits
+        stats["semantic_enabled"] = self.enabled
+        return stats
+
+
 class QueryCache:
     """Cache for complete query results (all stages)."""
 
-    def __init__(self, cache: ResponseCache):
+    def __init__(self, cache: ResponseCache) -> None:
         """
         Initialize query cache.
 
@@ -188,7 +859,13 @@ class QueryCache:
 
     def get_query_hash(self, user_query: str) -> str:
         """Generate hash for a user query."""
-        return hashlib.sha256(user_query.encode()).hexdigest()[:16]
+        h = _new_hash()
+        h.update(user_query.encode())
+        return h.hexdigest()[:16]
+
+    def get_cache_key(self, user_query: str) -> str:
+        """Cache key for a complete council result, derived from the query alone."""
+        return f"council:complete:{self.get_query_hash(user_query)}"
 
     async def get_cached_council_result(
         self,
@@ -203,11 +880,7 @@ class QueryCache:
         Returns:
             Cached result with all stages or None
         """
-        # Create a synthetic message format for caching
-        messages = [{"role": "user", "content": user_query}]
-
-        # Check if we have cached results for each stage
-        cached_result = await self.cache.get("council:complete", messages)
+        cached_result = await self.cache.get_by_raw_key(self.get_cache_key(user_query))
 
         if cached_result:
             logger.info(f"Found complete cached result for query")
@@ -236,8 +909,6 @@ class QueryCache:
         Returns:
             True if successfully cached
         """
-        messages = [{"role": "user", "content": user_query}]
-
         complete_result = {
             "stage1": stage1_results,
             "stage2": stage2_results,
@@ -246,7 +917,7 @@ class QueryCache:
             "cached_at": datetime.now().isoformat()
         }
 
-        return await self.cache.set("council:complete", messages, complete_result)
+        return await self.cache.set_by_raw_key(self.get_cache_key(user_query), complete_result)
 
 
 class CacheWarmer:
@@ -260,7 +931,7 @@ class CacheWarmer:
     ]
 
     @staticmethod
-    async def warm_cache(cache: ResponseCache, models: List[str]):
+    async def warm_cache(cache: ResponseCache, models: List[str]) -> None:
         """
         Pre-warm cache with common queries.
 
@@ -270,14 +941,18 @@ class CacheWarmer:
         """
         logger.info("Starting cache warming")
 
-        for query in CacheWarmer.COMMON_QUERIES:
-            messages = [{"role": "user", "content": query}]
+        requests = [
+            (model, [{"role": "user", "content": query}])
+            for query in CacheWarmer.COMMON_QUERIES
+            for model in models
+        ]
+
+        # One pipelined lookup for every query/model combination
+        existing = await cache.mget(requests)
 
-            for model in models:
-                # Check if already cached
-                existing = await cache.get(model, messages)
-                if not existing:
-                    # In production, you would actually query the model here
-                    logger.debug(f"Would warm cache for {model} with: {query[:50]}...")
+        for (model, messages), cached in zip(requests, existing):
+            if not cached:
+                # In production, you would actually query the model here
+                logger.debug(f"Would warm cache for {model} with: {messages[0]['content'][:50]}...")
 
         logger.info("Cache warming complete")
\ No newline at end of file
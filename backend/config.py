@@ -24,6 +24,10 @@ COUNCIL_MODELS = [
 # Chairman model - synthesizes final response
 CHAIRMAN_MODEL = "anthropic/claude-3.5-sonnet"
 
+# Skip the chairman when peer rankings already agree on a clear winner
+DIRECT_ANSWER_ENABLED = True
+DIRECT_ANSWER_MIN_MARGIN = 1.0  # Winner's average rank must beat runner-up by this much
+
 # Budget models for cost-conscious presets
 BUDGET_MODELS = [
     "anthropic/claude-3.5-haiku",            # Fast & cheap Claude
@@ -76,6 +80,19 @@ MODEL_COSTS = {
     for model, pricing in MODEL_PRICING.items()
 }
 
+# (input, output) USD per token, for costing actual usage
+MODEL_TOKEN_PRICES = {
+    model: (pricing["input"] / 1_000_000, pricing["output"] / 1_000_000)
+    for model, pricing in MODEL_PRICING.items()
+}
+
+# Estimated cost of one full council query per model:
+# ~2000 tokens per call across all 3 stages
+MODEL_FULL_QUERY_COST = {
+    model: cost_per_k * 6.0
+    for model, cost_per_k in MODEL_COSTS.items()
+}
+
 # Provider metadata for UI display
 MODEL_PROVIDERS = {
     "anthropic": {"name": "Anthropic", "color": "#D4A574"},
@@ -87,7 +104,16 @@ MODEL_PROVIDERS = {
 
 # Budget and rate limiting
 DEFAULT_MAX_BUDGET = 10.0  # Maximum spend per conversation in USD
+RUN_BUDGET_RESERVATION = 1.0  # USD set aside from the shared budget per council run
+COST_HISTORY_MAX_ENTRIES = 10000  # Bound for per-tracker usage history
 DEFAULT_CACHE_TTL = 86400  # 24 hours in seconds
+MEMORY_CACHE_MAX_ENTRIES = 10000  # Bound for the in-memory response cache
+BLOOM_REBUILD_INTERVAL = 30  # Seconds a Bloom filter of Redis keys is trusted before a rescan
+
+# Semantic cache - near-duplicate prompts reuse cached responses
+SEMANTIC_CACHE_MODEL = "sentence-transformers/all-MiniLM-L6-v2"
+SEMANTIC_CACHE_THRESHOLD = 0.95  # Minimum cosine similarity for a hit
+SEMANTIC_CACHE_MAX_ENTRIES = 10000  # Indexed prompts kept per model/context partition
 
 # OpenRouter API endpoint
 OPENROUTER_API_URL = "https://openrouter.ai/api/v1/chat/completions"
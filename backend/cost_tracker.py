@@ -1,9 +1,18 @@
 """Cost tracking and budget management for LLM queries."""
 
+import asyncio
 import logging
-from typing import Dict, List, Optional
+import re
+import time
+from collections import deque
+from functools import lru_cache
+from typing import Any, Deque, Dict, Iterator, List, Optional, Tuple
 from datetime import datetime
-from .config import MODEL_COSTS, MODEL_PRICING, DEFAULT_MAX_BUDGET
+import orjson
+from .config import (
+    MODEL_COSTS, MODEL_TOKEN_PRICES, DEFAULT_MAX_BUDGET, COST_HISTORY_MAX_ENTRIES,
+    RUN_BUDGET_RESERVATION
+)
 
 logger = logging.getLogger(__name__)
 
@@ -20,7 +29,10 @@ class CostTracker:
         """
         self.budget_limit = budget_limit
         self.current_spend = 0.0
-        self.cost_history = []
+        # Bounded history of orjson-encoded records with raw epoch timestamps
+        # (decoded and formatted in iter_history)
+        self.cost_history: Deque[bytes] = deque(maxlen=COST_HISTORY_MAX_ENTRIES)
+        self.queries_count = 0
         self.model_usage = {}
 
     def estimate_cost(
@@ -38,14 +50,7 @@ class CostTracker:
         Returns:
             Estimated cost in USD
         """
-        total_cost = 0.0
-
-        for model in models:
-            cost_per_k = MODEL_COSTS.get(model, 0.001)  # Default if unknown
-            model_cost = (estimated_tokens / 1000) * cost_per_k
-            total_cost += model_cost
-
-        return round(total_cost, 4)
+        return _estimate_cost(tuple(models), estimated_tokens)
 
     def can_proceed(self, estimated_cost: float) -> bool:
         """
@@ -91,10 +96,10 @@ class CostTracker:
             Dict with cost breakdown
         """
         # Use detailed pricing if available
-        if model in MODEL_PRICING and (input_tokens > 0 or output_tokens > 0):
-            pricing = MODEL_PRICING[model]
-            input_cost = (input_tokens / 1_000_000) * pricing["input"]
-            output_cost = (output_tokens / 1_000_000) * pricing["output"]
+        prices = MODEL_TOKEN_PRICES.get(model)
+        if prices is not None and (input_tokens > 0 or output_tokens > 0):
+            input_cost = input_tokens * prices[0]
+            output_cost = output_tokens * prices[1]
             cost = input_cost + output_cost
         else:
             # Fallback to legacy pricing
@@ -118,14 +123,16 @@ class CostTracker:
         }
 
         # Track history
-        self.cost_history.append({
-            "timestamp": datetime.now().isoformat(),
+        self.cost_history.append(orjson.dumps({
+            "timestamp": time.time(),
             **cost_info
-        })
+        }))
+        self.queries_count += 1
 
         # Track per-model usage
-        if model not in self.model_usage:
-            self.model_usage[model] = {
+        usage = self.model_usage.get(model)
+        if usage is None:
+            usage = self.model_usage[model] = {
                 "count": 0,
                 "total_tokens": 0,
                 "input_tokens": 0,
@@ -133,11 +140,11 @@ class CostTracker:
                 "total_cost": 0.0
             }
 
-        self.model_usage[model]["count"] += 1
-        self.model_usage[model]["total_tokens"] += cost_info["total_tokens"]
-        self.model_usage[model]["input_tokens"] += cost_info["input_tokens"]
-        self.model_usage[model]["output_tokens"] += cost_info["output_tokens"]
-        self.model_usage[model]["total_cost"] += cost
+        usage["count"] += 1
+        usage["total_tokens"] += cost_info["total_tokens"]
+        usage["input_tokens"] += cost_info["input_tokens"]
+        usage["output_tokens"] += cost_info["output_tokens"]
+        usage["total_cost"] += cost
 
         logger.info(
             f"Tracked usage: {model} - {cost_info['total_tokens']} tokens = ${cost:.6f} "
@@ -165,22 +172,113 @@ class CostTracker:
                 (self.current_spend / self.budget_limit * 100) if self.budget_limit > 0 else 0,
                 2
             ),
-            "queries_count": len(self.cost_history),
+            "queries_count": self.queries_count,
             "model_usage": self.model_usage,
             "average_cost_per_query": round(
-                self.current_spend / len(self.cost_history) if self.cost_history else 0,
+                self.current_spend / self.queries_count if self.queries_count else 0,
                 4
             )
         }
 
+    def iter_history(self) -> Iterator[Dict[str, Any]]:
+        """
+        Iterate over recorded usage with ISO-formatted timestamps.
+
+        Yields:
+            Cost entries, oldest first
+        """
+        for record in self.cost_history:
+            entry = orjson.loads(record)
+            entry["timestamp"] = datetime.fromtimestamp(entry["timestamp"]).isoformat()
+            yield entry
+
+    def history_ndjson(self) -> bytes:
+        """Recorded usage as newline-delimited JSON (epoch timestamps)."""
+        return b"".join(record + b"\n" for record in self.cost_history)
+
     def reset(self):
         """Reset cost tracking (new conversation/session)."""
         self.current_spend = 0.0
-        self.cost_history = []
+        self.cost_history.clear()
+        self.queries_count = 0
         self.model_usage = {}
         logger.info("Cost tracker reset")
 
 
+class BudgetLedger:
+    """
+    Process-wide budget shared by per-request CostTrackers.
+
+    Each council run tracks its own spend on a private CostTracker and
+    commits the total here once, so concurrent runs never mutate shared
+    tracker state. Issuing a tracker reserves its budget, so concurrent
+    runs together can never be allowed more than the remaining budget.
+    """
+
+    def __init__(self, budget_limit: float = DEFAULT_MAX_BUDGET):
+        """
+        Initialize budget ledger.
+
+        Args:
+            budget_limit: Maximum budget in USD
+        """
+        self.budget_limit = budget_limit
+        self.total_spend = 0.0
+        # Budget held by issued trackers that have not been committed yet
+        self.total_reserved = 0.0
+        self._reservations: Dict[int, float] = {}
+        self._lock = asyncio.Lock()
+
+    def get_remaining_budget(self) -> float:
+        """Get budget that is neither spent nor reserved."""
+        return max(0, self.budget_limit - self.total_spend - self.total_reserved)
+
+    def remaining_with(self, tracker: CostTracker) -> float:
+        """
+        Shared remaining budget once an open tracker is committed.
+
+        Args:
+            tracker: Tracker issued by new_tracker and not yet committed
+
+        Returns:
+            Unreserved budget plus the tracker's unspent reservation
+        """
+        return self.get_remaining_budget() + tracker.get_remaining_budget()
+
+    def new_tracker(self, reserve: float = RUN_BUDGET_RESERVATION) -> CostTracker:
+        """
+        Create a request-scoped tracker and reserve its budget.
+
+        Args:
+            reserve: USD to set aside; capped at the remaining budget
+
+        Returns:
+            Tracker limited to the reserved amount; pass it to commit when done
+        """
+        amount = min(reserve, self.get_remaining_budget())
+        tracker = CostTracker(budget_limit=amount)
+        # Synchronous, so no other coroutine can reserve in between
+        self._reservations[id(tracker)] = amount
+        self.total_reserved += amount
+        return tracker
+
+    async def commit(self, tracker: CostTracker) -> None:
+        """
+        Record a finished request's spend and release its reservation.
+
+        Args:
+            tracker: Tracker issued by new_tracker (committing it again is a no-op)
+        """
+        async with self._lock:
+            reserved = self._reservations.pop(id(tracker), None)
+            if reserved is None:
+                return
+            self.total_reserved = max(0.0, self.total_reserved - reserved)
+            self.total_spend += tracker.current_spend
+
+        logger.debug(f"Committed ${tracker.current_spend:.6f} (Total: ${self.total_spend:.4f})")
+
+
 class SmartModelSelector:
     """Select appropriate models based on query complexity and budget."""
 
@@ -201,24 +299,31 @@ class SmartModelSelector:
     }
 
     MODEL_TIERS = {
-        "budget": [
+        "budget": (
             "deepseek/deepseek-chat",
             "anthropic/claude-3.5-haiku",
             "openai/gpt-4o-mini",
             "google/gemini-1.5-flash"
-        ],
-        "standard": [
+        ),
+        "standard": (
             "anthropic/claude-3.5-sonnet",
             "openai/gpt-4o",
             "google/gemini-1.5-pro",
             "deepseek/deepseek-chat"
-        ],
-        "premium": [
+        ),
+        "premium": (
             "anthropic/claude-3.5-sonnet",
             "anthropic/claude-3-opus",
             "openai/gpt-4o",
             "google/gemini-1.5-pro"
-        ]
+        )
+    }
+
+    # Inverted index; built in reverse so the first tier listing a model wins
+    _MODEL_TO_TIER: Dict[str, str] = {
+        model: tier
+        for tier, models in reversed(list(MODEL_TIERS.items()))
+        for model in models
     }
 
     @classmethod
@@ -232,20 +337,7 @@ class SmartModelSelector:
         Returns:
             Complexity level: 'simple', 'medium', or 'complex'
         """
-        query_lower = query.lower()
-
-        # Check for complex indicators
-        for keyword in cls.COMPLEXITY_KEYWORDS["complex"]:
-            if keyword in query_lower:
-                return "complex"
-
-        # Check for simple indicators
-        for keyword in cls.COMPLEXITY_KEYWORDS["simple"]:
-            if keyword in query_lower:
-                return "simple"
-
-        # Default to medium
-        return "medium"
+        return _assess_complexity(query.lower())
 
     @classmethod
     def select_models(
@@ -284,7 +376,7 @@ class SmartModelSelector:
             if budget_remaining < 1.0 and tier == "premium":
                 tier = "standard"
 
-        selected = cls.MODEL_TIERS[tier]
+        selected = list(cls.MODEL_TIERS[tier])
 
         logger.info(
             f"Selected {tier} tier models for query "
@@ -306,16 +398,41 @@ class SmartModelSelector:
         """
         cost = MODEL_COSTS.get(model, 0.001)
 
-        # Determine tier
-        tier = "unknown"
-        for tier_name, models in cls.MODEL_TIERS.items():
-            if model in models:
-                tier = tier_name
-                break
+        tier = cls._MODEL_TO_TIER.get(model, "unknown")
 
         return {
             "model": model,
             "cost_per_1k_tokens": cost,
             "tier": tier,
             "provider": model.split("/")[0] if "/" in model else "unknown"
-        }
\ No newline at end of file
+        }
+
+
+def _keyword_alternation(tier: str) -> str:
+    """Regex alternation of a tier's keywords, built from COMPLEXITY_KEYWORDS."""
+    return "|".join(map(re.escape, SmartModelSelector.COMPLEXITY_KEYWORDS[tier]))
+
+
+# One search classifies the query: the complex branch is tried against the
+# whole string before the simple one, and match.lastgroup names the tier
+_COMPLEXITY_RE = re.compile(
+    rf"(?=.*?(?P<complex>{_keyword_alternation('complex')}))"
+    rf"|(?=.*?(?P<simple>{_keyword_alternation('simple')}))",
+    re.DOTALL
+)
+
+
+@lru_cache(maxsize=2048)
+def _assess_complexity(query_lower: str) -> str:
+    """Cached keyword scan behind SmartModelSelector.assess_complexity."""
+    match = _COMPLEXITY_RE.match(query_lower)
+    # Default to medium
+    return match.lastgroup if match else "medium"
+
+
+@lru_cache(maxsize=256)
+def _estimate_cost(models: Tuple[str, ...], estimated_tokens: int) -> float:
+    """Cached cost estimate behind CostTracker.estimate_cost."""
+    # Sum per-1K rates first (unknown models default to $0.001), scale once
+    cost_per_k = MODEL_COSTS.get
+    return round(sum(cost_per_k(model, 0.001) for model in models) * (estimated_tokens / 1000), 4)
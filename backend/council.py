@@ -1,28 +1,126 @@
 """3-stage LLM Council orchestration."""
 
+import asyncio
+import copy
+import hashlib
+import io
 import logging
-from typing import List, Dict, Any, Tuple, Optional
-from .openrouter import query_models_parallel, query_model
-from .config import COUNCIL_MODELS, CHAIRMAN_MODEL, MODEL_PROVIDERS, MODEL_PRICING
+import re
+from itertools import chain
+from operator import itemgetter
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+import orjson
+from cachetools import LRUCache
+from .openrouter import query_models_parallel_stream, query_model
+from .config import (
+    COUNCIL_MODELS, CHAIRMAN_MODEL, MODEL_PROVIDERS, MODEL_PRICING, MODEL_TOKEN_PRICES,
+    DIRECT_ANSWER_ENABLED, DIRECT_ANSWER_MIN_MARGIN
+)
 from .resilience import ResilientCouncil, PartialResponseHandler
-from .cache import ResponseCache, QueryCache
-from .cost_tracker import CostTracker, SmartModelSelector
+from .cache import ResponseCache, SemanticCache, QueryCache
+from .cost_tracker import BudgetLedger, CostTracker, SmartModelSelector
 from .agent_roles import CouncilComposer, RoleAssigner
 
 logger = logging.getLogger(__name__)
 
 # Initialize shared instances
 resilient_council = ResilientCouncil(min_responses_required=3)
-cache = ResponseCache()
+# Exact-match cache with a near-duplicate (semantic) layer; a passthrough
+# when no embedding backend is installed
+cache = SemanticCache(ResponseCache())
 query_cache = QueryCache(cache)
-cost_tracker = CostTracker()
+budget_ledger = BudgetLedger()
 council_composer = CouncilComposer()
 
+# Anonymous stage 2 labels: "Response A" ... "Response Z"
+_RESPONSE_LABELS = tuple(f"Response {chr(65 + i)}" for i in range(26))
+
+# Ranking parser patterns, compiled once
+# Numbered entry: number followed by separator, then "Response X"
+_NUMBERED_RANK_RE = re.compile(r'(\d+)[\.\)\:\s]+\s*Response\s+([A-Z])', re.IGNORECASE)
+_RANKING_HEADER_RES = tuple(
+    re.compile(pattern, re.IGNORECASE)
+    for pattern in (
+        r'FINAL RANKING[:\s]*',
+        r'MY RANKING[:\s]*',
+        r'RANKING[:\s]*\n',
+        r'RANKED ORDER[:\s]*',
+    )
+)
+_BULLET_RANK_RE = re.compile(r'[-•*]\s*Response\s+([A-Z])\s*(?:\(|$|\n)', re.IGNORECASE)
+
+# Stage 2 prompt. The static instructions go first as a system message so
+# providers with prompt caching can reuse them as a byte-identical prefix;
+# the user message is filled with str.format(user_query=..., responses_text=...)
+_RANKING_SYSTEM_PROMPT = """You are evaluating different responses to a user's question. The question and the anonymized responses from different models follow.
+
+Your task:
+1. First, evaluate each response individually. For each response, explain what it does well and what it does poorly.
+2. Then, at the very end of your response, provide a final ranking.
+
+IMPORTANT: Your final ranking MUST be formatted EXACTLY as follows:
+- Start with the line "FINAL RANKING:" (all caps, with colon)
+- Then list the responses from best to worst as a numbered list
+- Each line should be: number, period, space, then ONLY the response label (e.g., "1. Response A")
+- Do not add any other text or explanations in the ranking section
+
+Example of the correct format for your ENTIRE response:
+
+Response A provides good detail on X but misses Y...
+Response B is accurate but lacks depth on Z...
+Response C offers the most comprehensive answer...
+
+FINAL RANKING:
+1. Response C
+2. Response A
+3. Response B"""
+_RANKING_PROMPT_TMPL = """Question: {user_query}
+
+Here are the responses from different models (anonymized):
+
+{responses_text}
+
+Now provide your evaluation and ranking:"""
+
+
+def _build_model_meta(model_id: str) -> Tuple[Dict[str, str], Optional[float], Optional[float]]:
+    """(provider info, input price, output price) for a model id."""
+    provider_key = model_id.split('/')[0] if '/' in model_id else 'unknown'
+    provider = MODEL_PROVIDERS.get(provider_key, {"name": provider_key.title(), "color": "#888888"})
+    input_price, output_price = MODEL_TOKEN_PRICES.get(model_id, (None, None))
+    return provider, input_price, output_price
+
+
+# Precomputed for every configured model
+_MODEL_META = {model: _build_model_meta(model) for model in {*COUNCIL_MODELS, *MODEL_PRICING}}
+
+
+def _model_meta(model_id: str) -> Tuple[Dict[str, str], Optional[float], Optional[float]]:
+    """Single-lookup model metadata; unknown ids are built without being stored."""
+    return _MODEL_META.get(model_id) or _build_model_meta(model_id)
+
+
+def _response_cost(model_id: str, response: Dict[str, Any]) -> float:
+    """Cost recorded by track_usage, or derived from usage for older cache entries."""
+    cost = response.get('cost')
+    if cost is not None:
+        return cost
+
+    _, input_price, output_price = _model_meta(model_id)
+    if input_price is None:
+        return 0.0
+    usage = response.get('usage', {})
+    return round(
+        usage.get('prompt_tokens', 0) * input_price + usage.get('completion_tokens', 0) * output_price,
+        6
+    )
+
 
 async def stage1_collect_responses(
     user_query: str,
     use_smart_selection: bool = True,
-    council_config: Optional[Dict[str, Any]] = None
+    council_config: Optional[Dict[str, Any]] = None,
+    tracker: Optional[CostTracker] = None
 ) -> List[Dict[str, Any]]:
     """
     Stage 1: Collect individual responses from all council models with resilience and caching.
@@ -30,15 +128,30 @@ async def stage1_collect_responses(
     Args:
         user_query: The user's question
         use_smart_selection: Whether to use smart model selection based on complexity
+        tracker: Request-scoped cost tracker (a new one is committed to the ledger if omitted)
 
     Returns:
         List of dicts with 'model' and 'response' keys
     """
+    if tracker is None:
+        # A tracker of our own is settled with the ledger however this call ends
+        tracker = budget_ledger.new_tracker()
+        try:
+            return await stage1_collect_responses(
+                user_query,
+                use_smart_selection=use_smart_selection,
+                council_config=council_config,
+                tracker=tracker
+            )
+        finally:
+            await budget_ledger.commit(tracker)
+
     messages = [{"role": "user", "content": user_query}]
 
-    # Smart model selection based on query complexity and budget
+    # Smart model selection based on query complexity and the shared budget
+    # (the tracker only holds this run's reservation)
     if use_smart_selection:
-        remaining_budget = cost_tracker.get_remaining_budget()
+        remaining_budget = budget_ledger.remaining_with(tracker)
         selected_models = SmartModelSelector.select_models(
             user_query,
             remaining_budget
@@ -47,17 +160,17 @@ async def stage1_collect_responses(
         selected_models = COUNCIL_MODELS
 
     # Check budget before proceeding
-    estimated_cost = cost_tracker.estimate_cost(selected_models)
-    if not cost_tracker.can_proceed(estimated_cost):
+    estimated_cost = tracker.estimate_cost(selected_models)
+    if not tracker.can_proceed(estimated_cost):
         logger.error(f"Budget exceeded. Estimated cost: ${estimated_cost:.4f}")
-        raise ValueError(f"Budget limit exceeded. Remaining: ${cost_tracker.get_remaining_budget():.2f}")
+        raise ValueError(f"Budget limit exceeded. Remaining: ${tracker.get_remaining_budget():.2f}")
 
-    # Try to get cached responses first
+    # Try to get cached responses first (one batched lookup for all models)
     cached_responses = {}
     uncached_models = []
 
-    for model in selected_models:
-        cached = await cache.get(model, messages)
+    cached_list = await cache.mget([(model, messages) for model in selected_models])
+    for model, cached in zip(selected_models, cached_list):
         if cached:
             cached_responses[model] = cached
             logger.info(f"Cache hit for {model}")
@@ -73,56 +186,47 @@ async def stage1_collect_responses(
             messages
         )
 
-        # Cache fresh responses and track costs
+        # Track costs
         for model, response in fresh_responses.items():
             if response:
-                await cache.set(model, messages, response)
                 # Track cost with detailed token breakdown
                 usage = response.get('usage', {})
-                cost_tracker.track_usage(
+                cost_info = tracker.track_usage(
                     model,
                     tokens=usage.get('total_tokens', 1000),
                     input_tokens=usage.get('prompt_tokens', 0),
                     output_tokens=usage.get('completion_tokens', 0)
                 )
+                # Stored with the response so cache hits report it as-is
+                response['cost'] = cost_info['total_cost']
 
-    # Combine all responses
-    all_responses = {**cached_responses, **fresh_responses}
-
-    # Helper to get provider info
-    def get_provider_info(model_id: str) -> Dict[str, str]:
-        provider_key = model_id.split('/')[0] if '/' in model_id else 'unknown'
-        return MODEL_PROVIDERS.get(provider_key, {"name": provider_key.title(), "color": "#888888"})
-
-    # Helper to calculate cost for a response
-    def calc_cost(model_id: str, usage: Dict) -> float:
-        if model_id in MODEL_PRICING:
-            pricing = MODEL_PRICING[model_id]
-            input_cost = (usage.get('prompt_tokens', 0) / 1_000_000) * pricing['input']
-            output_cost = (usage.get('completion_tokens', 0) / 1_000_000) * pricing['output']
-            return round(input_cost + output_cost, 6)
-        return 0.0
+        # Cache fresh responses in one batch
+        await cache.mset([
+            (model, messages, response)
+            for model, response in fresh_responses.items()
+            if response
+        ])
 
     # Format results with cost/token info
     stage1_results = []
-    for model, response in all_responses.items():
+    for model, response in chain(cached_responses.items(), fresh_responses.items()):
         if response is not None and resilient_council.validate_response(response):
             usage = response.get('usage', {})
             stage1_results.append({
                 "model": model,
                 "response": response.get('content', ''),
-                "provider": get_provider_info(model),
+                "provider": _model_meta(model)[0],
                 "tokens": {
                     "input": usage.get('prompt_tokens', 0),
                     "output": usage.get('completion_tokens', 0),
                     "total": usage.get('total_tokens', 0)
                 },
-                "cost": calc_cost(model, usage)
+                "cost": _response_cost(model, response)
             })
 
-    # Check if we have enough responses
+    # Check if we have enough responses (results are already validated)
     if not PartialResponseHandler.can_proceed_with_partial(
-        {m: r for m, r in zip([r["model"] for r in stage1_results], stage1_results)},
+        stage1_results,
         min_required=resilient_council.min_responses_required
     ):
         logger.warning(f"Only got {len(stage1_results)} valid responses")
@@ -130,9 +234,28 @@ async def stage1_collect_responses(
     return stage1_results
 
 
+def build_stage_blocks(stage1_results: List[Dict[str, Any]]) -> List[Tuple[str, str, str]]:
+    """
+    Pair each Stage 1 response with its anonymized label, once per run.
+
+    Stage 2 renders the label view and Stage 3 the model view of the same blocks.
+
+    Args:
+        stage1_results: Results from Stage 1
+
+    Returns:
+        List of (label, model, response text) tuples in Stage 1 order
+    """
+    return [
+        (label, result['model'], result['response'])
+        for label, result in zip(_RESPONSE_LABELS, stage1_results)
+    ]
+
+
 async def stage2_collect_rankings(
     user_query: str,
-    stage1_results: List[Dict[str, Any]]
+    stage1_results: List[Dict[str, Any]],
+    stage_blocks: Optional[List[Tuple[str, str, str]]] = None
 ) -> Tuple[List[Dict[str, Any]], Dict[str, str]]:
     """
     Stage 2: Each model ranks the anonymized responses.
@@ -140,64 +263,41 @@ async def stage2_collect_rankings(
     Args:
         user_query: The original user query
         stage1_results: Results from Stage 1
+        stage_blocks: Output of build_stage_blocks (built here if omitted)
 
     Returns:
         Tuple of (rankings list, label_to_model mapping)
     """
-    # Create anonymized labels for responses (Response A, Response B, etc.)
-    labels = [chr(65 + i) for i in range(len(stage1_results))]  # A, B, C, ...
+    if stage_blocks is None:
+        stage_blocks = build_stage_blocks(stage1_results)
 
-    # Create mapping from label to model name
-    label_to_model = {
-        f"Response {label}": result['model']
-        for label, result in zip(labels, stage1_results)
-    }
+    # Create mapping from anonymized label (Response A, Response B, etc.) to model name
+    label_to_model = {label: model for label, model, _ in stage_blocks}
 
     # Build the ranking prompt
-    responses_text = "\n\n".join([
-        f"Response {label}:\n{result['response']}"
-        for label, result in zip(labels, stage1_results)
-    ])
-
-    ranking_prompt = f"""You are evaluating different responses to the following question:
-
-Question: {user_query}
-
-Here are the responses from different models (anonymized):
-
-{responses_text}
-
-Your task:
-1. First, evaluate each response individually. For each response, explain what it does well and what it does poorly.
-2. Then, at the very end of your response, provide a final ranking.
-
-IMPORTANT: Your final ranking MUST be formatted EXACTLY as follows:
-- Start with the line "FINAL RANKING:" (all caps, with colon)
-- Then list the responses from best to worst as a numbered list
-- Each line should be: number, period, space, then ONLY the response label (e.g., "1. Response A")
-- Do not add any other text or explanations in the ranking section
-
-Example of the correct format for your ENTIRE response:
-
-Response A provides good detail on X but misses Y...
-Response B is accurate but lacks depth on Z...
-Response C offers the most comprehensive answer...
-
-FINAL RANKING:
-1. Response C
-2. Response A
-3. Response B
-
-Now provide your evaluation and ranking:"""
-
-    messages = [{"role": "user", "content": ranking_prompt}]
-
-    # Get rankings from all council models in parallel
-    responses = await query_models_parallel(COUNCIL_MODELS, messages)
+    buf = io.StringIO()
+    separator = ""
+    for label, _, text in stage_blocks:
+        buf.write(separator)
+        buf.write(label)
+        buf.write(":\n")
+        buf.write(text)
+        separator = "\n\n"
+    responses_text = buf.getvalue()
+
+    ranking_prompt = _RANKING_PROMPT_TMPL.format(
+        user_query=user_query,
+        responses_text=responses_text
+    )
+
+    messages = [
+        {"role": "system", "content": _RANKING_SYSTEM_PROMPT},
+        {"role": "user", "content": ranking_prompt}
+    ]
 
-    # Format results
+    # Get rankings from all council models in parallel, parsing each as it lands
     stage2_results = []
-    for model, response in responses.items():
+    async for model, response in query_models_parallel_stream(COUNCIL_MODELS, messages):
         if response is not None:
             full_text = response.get('content', '')
             parsed = parse_ranking_from_text(full_text)
@@ -207,13 +307,49 @@ Now provide your evaluation and ranking:"""
                 "parsed_ranking": parsed
             })
 
+    # Restore council order so results don't depend on arrival timing
+    model_order = {model: i for i, model in enumerate(COUNCIL_MODELS)}
+    stage2_results.sort(key=lambda result: model_order[result["model"]])
+
     return stage2_results, label_to_model
 
 
+# Stage 3 prompt: static role and task first (cacheable prefix), then the run's content
+_CHAIRMAN_SYSTEM_PROMPT = """You are the Chairman of an LLM Council. Multiple AI models have provided responses to a user's question, and then ranked each other's responses.
+
+Your task as Chairman is to synthesize all of this information into a single, comprehensive, accurate answer to the user's original question. Consider:
+- The individual responses and their insights
+- The peer rankings and what they reveal about response quality
+- Any patterns of agreement or disagreement"""
+_CHAIRMAN_PROMPT_TAIL = (
+    "\n\nProvide a clear, well-reasoned final answer that represents "
+    "the council's collective wisdom:"
+)
+
+
+def _write_model_blocks(
+    buf: io.StringIO,
+    blocks: Iterable[Tuple[str, str]],
+    title: str
+) -> None:
+    """Write "Model: ...\n<title>: ..." blocks from (model, text) pairs, separated by blank lines."""
+    separator = ""
+    for model, text in blocks:
+        buf.write(separator)
+        buf.write("Model: ")
+        buf.write(model)
+        buf.write("\n")
+        buf.write(title)
+        buf.write(": ")
+        buf.write(text)
+        separator = "\n\n"
+
+
 async def stage3_synthesize_final(
     user_query: str,
     stage1_results: List[Dict[str, Any]],
-    stage2_results: List[Dict[str, Any]]
+    stage2_results: List[Dict[str, Any]],
+    stage_blocks: Optional[List[Tuple[str, str, str]]] = None
 ) -> Dict[str, Any]:
     """
     Stage 3: Chairman synthesizes final response.
@@ -222,39 +358,28 @@ async def stage3_synthesize_final(
         user_query: The original user query
         stage1_results: Individual model responses from Stage 1
         stage2_results: Rankings from Stage 2
+        stage_blocks: Output of build_stage_blocks (built here if omitted)
 
     Returns:
         Dict with 'model' and 'response' keys
     """
-    # Build comprehensive context for chairman
-    stage1_text = "\n\n".join([
-        f"Model: {result['model']}\nResponse: {result['response']}"
-        for result in stage1_results
-    ])
-
-    stage2_text = "\n\n".join([
-        f"Model: {result['model']}\nRanking: {result['ranking']}"
-        for result in stage2_results
-    ])
-
-    chairman_prompt = f"""You are the Chairman of an LLM Council. Multiple AI models have provided responses to a user's question, and then ranked each other's responses.
-
-Original Question: {user_query}
-
-STAGE 1 - Individual Responses:
-{stage1_text}
-
-STAGE 2 - Peer Rankings:
-{stage2_text}
-
-Your task as Chairman is to synthesize all of this information into a single, comprehensive, accurate answer to the user's original question. Consider:
-- The individual responses and their insights
-- The peer rankings and what they reveal about response quality
-- Any patterns of agreement or disagreement
-
-Provide a clear, well-reasoned final answer that represents the council's collective wisdom:"""
-
-    messages = [{"role": "user", "content": chairman_prompt}]
+    # Build comprehensive context for chairman in a single buffer
+    buf = io.StringIO()
+    buf.write("Original Question: ")
+    buf.write(user_query)
+    buf.write("\n\nSTAGE 1 - Individual Responses:\n")
+    if stage_blocks is None:
+        stage_blocks = build_stage_blocks(stage1_results)
+    _write_model_blocks(buf, ((model, text) for _, model, text in stage_blocks), "Response")
+    buf.write("\n\nSTAGE 2 - Peer Rankings:\n")
+    _write_model_blocks(buf, ((r['model'], r['ranking']) for r in stage2_results), "Ranking")
+    buf.write(_CHAIRMAN_PROMPT_TAIL)
+    chairman_prompt = buf.getvalue()
+
+    messages = [
+        {"role": "system", "content": _CHAIRMAN_SYSTEM_PROMPT},
+        {"role": "user", "content": chairman_prompt}
+    ]
 
     # Query the chairman model
     response = await query_model(CHAIRMAN_MODEL, messages)
@@ -272,6 +397,50 @@ Provide a clear, well-reasoned final answer that represents the council's collec
     }
 
 
+def _extract_ranking_from_section(section: str) -> List[str]:
+    """Extract rankings from a text section, looking for consecutive numbered list."""
+    # Find all numbered entries with Response labels
+    matches = _NUMBERED_RANK_RE.findall(section)
+
+    if not matches:
+        return []
+
+    # Build a dict: position -> letter
+    ranking_dict = {}
+    for num_str, letter in matches:
+        num = int(num_str)
+        # Only accept positions 1-10 (reasonable ranking range)
+        if 1 <= num <= 10:
+            # If we already have this position, only keep first occurrence
+            ranking_dict.setdefault(num, letter.upper())
+
+    if not ranking_dict:
+        return []
+
+    # Check if we have consecutive numbers starting from 1
+    # This filters out scattered mentions like "Response A in point 3..."
+    sorted_positions = sorted(ranking_dict.keys())
+
+    # Must start with 1 and be consecutive (1,2,3 not 1,3,5)
+    if sorted_positions[0] != 1:
+        return []
+
+    results = []
+    for i, expected_pos in enumerate(range(1, len(sorted_positions) + 1)):
+        if i < len(sorted_positions) and sorted_positions[i] == expected_pos:
+            results.append(f"Response {ranking_dict[expected_pos]}")
+        else:
+            break  # Stop at first gap
+
+    # Must have at least 2 rankings to be valid
+    return results if len(results) >= 2 else []
+
+
+# Parsed rankings keyed by a digest of the full ranking text, so repeated
+# Stage 2 texts skip the regex strategies without keeping the texts alive
+_parsed_rankings: LRUCache = LRUCache(maxsize=4096)
+
+
 def parse_ranking_from_text(ranking_text: str) -> List[str]:
     """
     Parse the FINAL RANKING section from the model's response.
@@ -282,90 +451,62 @@ def parse_ranking_from_text(ranking_text: str) -> List[str]:
     Returns:
         List of response labels in ranked order (max 3-5 items typically)
     """
-    import re
-
-    def extract_ranking_from_section(section: str) -> List[str]:
-        """Extract rankings from a text section, looking for consecutive numbered list."""
-        # Find all numbered entries with Response labels
-        # Pattern: number followed by separator, then "Response X"
-        pattern = r'(\d+)[\.\)\:\s]+\s*Response\s+([A-Z])'
-        matches = re.findall(pattern, section, re.IGNORECASE)
-
-        if not matches:
-            return []
-
-        # Build a dict: position -> letter
-        ranking_dict = {}
-        for num_str, letter in matches:
-            num = int(num_str)
-            # Only accept positions 1-10 (reasonable ranking range)
-            if 1 <= num <= 10:
-                # If we already have this position, only keep first occurrence
-                if num not in ranking_dict:
-                    ranking_dict[num] = letter.upper()
-
-        if not ranking_dict:
-            return []
-
-        # Check if we have consecutive numbers starting from 1
-        # This filters out scattered mentions like "Response A in point 3..."
-        sorted_positions = sorted(ranking_dict.keys())
-
-        # Must start with 1 and be consecutive (1,2,3 not 1,3,5)
-        if sorted_positions[0] != 1:
-            return []
-
-        results = []
-        for i, expected_pos in enumerate(range(1, len(sorted_positions) + 1)):
-            if i < len(sorted_positions) and sorted_positions[i] == expected_pos:
-                results.append(f"Response {ranking_dict[expected_pos]}")
-            else:
-                break  # Stop at first gap
-
-        # Must have at least 2 rankings to be valid
-        return results if len(results) >= 2 else []
+    # The header search spans the whole text, so the key covers all of it
+    key = hashlib.blake2b(ranking_text.encode('utf-8', 'surrogatepass'), digest_size=16).digest()
+    parsed = _parsed_rankings.get(key)
+    if parsed is None:
+        parsed = _parsed_rankings[key] = tuple(_parse_ranking(ranking_text))
+    return list(parsed)
+
+
+def _parse_ranking(ranking_text: str) -> List[str]:
+    """Uncached ranking parse; see parse_ranking_from_text."""
+    # Every strategy needs at least two "Response <letter>" mentions; a single
+    # C-level count rules out malformed or refused output before any regex runs
+    # (counted without the space, since the patterns accept any whitespace)
+    if ranking_text.lower().count('response') < 2:
+        return []
+
+    # Sections already scanned in this call; e.g. "FINAL RANKING:\n" and
+    # "RANKING:\n" end at the same offset and yield the same section
+    scanned: Dict[str, List[str]] = {}
+
+    def extract(section: str) -> List[str]:
+        results = scanned.get(section)
+        if results is None:
+            results = scanned[section] = _extract_ranking_from_section(section)
+        return results
 
     # Strategy 1: Look for explicit "FINAL RANKING:" section
-    ranking_headers = [
-        r'FINAL RANKING[:\s]*',
-        r'MY RANKING[:\s]*',
-        r'RANKING[:\s]*\n',
-        r'RANKED ORDER[:\s]*',
-    ]
-
-    for header_pattern in ranking_headers:
-        ranking_match = re.search(header_pattern, ranking_text, re.IGNORECASE)
+    for header_re in _RANKING_HEADER_RES:
+        ranking_match = header_re.search(ranking_text)
         if ranking_match:
             # Extract section after the header (limit to avoid evaluation text)
             ranking_section = ranking_text[ranking_match.end():ranking_match.end() + 300]
-            results = extract_ranking_from_section(ranking_section)
+            results = extract(ranking_section)
             if results:
                 return results
 
     # Strategy 2: Look for ranking at the very end of the response
-    # Split into paragraphs and check the last few
-    paragraphs = ranking_text.strip().split('\n\n')
+    # Split from the end: only the last 2 paragraphs are needed
+    paragraphs = ranking_text.strip().rsplit('\n\n', 2)
     if len(paragraphs) >= 1:
         # Check last 2 paragraphs
         last_content = '\n\n'.join(paragraphs[-2:]) if len(paragraphs) >= 2 else paragraphs[-1]
         # Limit to last 400 chars
         last_content = last_content[-400:]
-        results = extract_ranking_from_section(last_content)
+        results = extract(last_content)
         if results:
             return results
 
     # Strategy 3: Look for bullet-point rankings anywhere
-    bullet_pattern = r'[-•*]\s*Response\s+([A-Z])\s*(?:\(|$|\n)'
-    bullet_matches = re.findall(bullet_pattern, ranking_text[-500:], re.IGNORECASE)
+    bullet_matches = _BULLET_RANK_RE.findall(ranking_text[-500:])
     if len(bullet_matches) >= 2:
         # Deduplicate while preserving order
-        seen = set()
-        results = []
-        for letter in bullet_matches:
-            upper_letter = letter.upper()
-            if upper_letter not in seen:
-                seen.add(upper_letter)
-                results.append(f"Response {upper_letter}")
+        results = [
+            f"Response {letter}"
+            for letter in dict.fromkeys(letter.upper() for letter in bullet_matches)
+        ]
         if len(results) >= 2:
             return results
 
@@ -387,32 +528,30 @@ def calculate_aggregate_rankings(
     Returns:
         List of dicts with model name and average rank, sorted best to worst
     """
-    from collections import defaultdict
-
-    # Track positions for each model
-    model_positions = defaultdict(list)
+    # Running (position sum, count) per model, accumulated in one pass
+    totals: Dict[str, Tuple[int, int]] = {}
 
     for ranking in stage2_results:
-        ranking_text = ranking['ranking']
-
-        # Parse the ranking from the structured format
-        parsed_ranking = parse_ranking_from_text(ranking_text)
+        # Stage 2 already parsed each ranking; only parse results that lack it
+        parsed_ranking = ranking.get('parsed_ranking')
+        if parsed_ranking is None:
+            parsed_ranking = parse_ranking_from_text(ranking['ranking'])
 
         for position, label in enumerate(parsed_ranking, start=1):
-            if label in label_to_model:
-                model_name = label_to_model[label]
-                model_positions[model_name].append(position)
+            model_name = label_to_model.get(label)
+            if model_name is not None:
+                total, count = totals.get(model_name, (0, 0))
+                totals[model_name] = (total + position, count + 1)
 
     # Calculate average position for each model
-    aggregate = []
-    for model, positions in model_positions.items():
-        if positions:
-            avg_rank = sum(positions) / len(positions)
-            aggregate.append({
-                "model": model,
-                "average_rank": round(avg_rank, 2),
-                "rankings_count": len(positions)
-            })
+    aggregate = [
+        {
+            "model": model,
+            "average_rank": round(total / count, 2),
+            "rankings_count": count
+        }
+        for model, (total, count) in totals.items()
+    ]
 
     # Sort by average rank (lower is better)
     aggregate.sort(key=lambda x: x['average_rank'])
@@ -420,6 +559,45 @@ def calculate_aggregate_rankings(
     return aggregate
 
 
+def _dominant_winner(
+    aggregate_rankings: List[Dict[str, Any]],
+    stage2_results: List[Dict[str, Any]],
+    label_to_model: Dict[str, str]
+) -> Optional[str]:
+    """
+    Find a stage 1 model whose answer can stand in for the chairman's synthesis.
+
+    The winner must beat the runner-up's average rank by DIRECT_ANSWER_MIN_MARGIN
+    and be ranked first on at least ceil(N/2) + 1 of the N parsed ballots.
+
+    Args:
+        aggregate_rankings: Output of calculate_aggregate_rankings (best first)
+        stage2_results: Rankings from each model
+        label_to_model: Mapping from anonymous labels to model names
+
+    Returns:
+        Winning model name, or None if the chairman should synthesize
+    """
+    if not DIRECT_ANSWER_ENABLED or len(aggregate_rankings) < 2:
+        return None
+
+    best, runner_up = aggregate_rankings[0], aggregate_rankings[1]
+    if runner_up["average_rank"] - best["average_rank"] < DIRECT_ANSWER_MIN_MARGIN:
+        return None
+
+    winner = best["model"]
+    ballots = [r["parsed_ranking"] for r in stage2_results if r.get("parsed_ranking")]
+    first_places = sum(1 for ranking in ballots if label_to_model.get(ranking[0]) == winner)
+    if first_places < -(-len(ballots) // 2) + 1:
+        return None
+
+    return winner
+
+
+# Queries up to this length are used as their own title
+_LOCAL_TITLE_MAX_QUERY_LEN = 60
+
+
 async def generate_conversation_title(user_query: str) -> str:
     """
     Generate a short title for a conversation based on the first user message.
@@ -430,6 +608,14 @@ async def generate_conversation_title(user_query: str) -> str:
     Returns:
         A short title (3-5 words)
     """
+    # Short queries already make a good title; skip the model round-trip
+    stripped = " ".join(user_query.split())
+    if len(stripped) <= _LOCAL_TITLE_MAX_QUERY_LEN:
+        title = stripped.rstrip("?.!:")
+        if len(title) > 50:
+            title = title[:50].rsplit(' ', 1)[0]
+        return title or "New Conversation"
+
     title_prompt = f"""Generate a very short title (3-5 words maximum) that summarizes the following question.
 The title should be concise and descriptive. Do not use quotes or punctuation in the title.
 
@@ -458,6 +644,36 @@ Title:"""
     return title
 
 
+_CACHED_STAGES = itemgetter("stage1", "stage2", "stage3", "metadata")
+
+
+def _fast_return_cached(cached_result: Dict[str, Any]) -> Tuple[List, List, Dict, Dict]:
+    """Mark a cached council result as a free cache hit and unpack it."""
+    logger.info("Using cached council result")
+    metadata = cached_result["metadata"]
+    metadata["cache_hit"] = True
+    metadata["cost"] = 0.0
+    return _CACHED_STAGES(cached_result)
+
+
+# Council runs in progress, keyed by _inflight_key, shared by identical concurrent requests
+_inflight: Dict[str, "asyncio.Task[Tuple[List, List, Dict, Dict]]"] = {}
+
+
+def _inflight_key(
+    user_query: str,
+    use_cache: bool,
+    council_config: Optional[Dict[str, Any]]
+) -> str:
+    """Identify a council run by its (already normalized) query and options."""
+    payload = orjson.dumps(
+        [user_query, use_cache, council_config],
+        option=orjson.OPT_SORT_KEYS,
+        default=str
+    )
+    return hashlib.blake2b(payload, digest_size=16).hexdigest()
+
+
 async def run_full_council(
     user_query: str,
     use_cache: bool = True,
@@ -466,36 +682,55 @@ async def run_full_council(
     """
     Run the complete 3-stage council process with caching and resilience.
 
+    Identical concurrent requests (ignoring surrounding whitespace) share a
+    single run instead of each paying for all three stages; each caller gets
+    its own copy of the result.
+
     Args:
         user_query: The user's question
         use_cache: Whether to use cached results if available
+        council_config: Optional council composition passed to stage 1
 
     Returns:
         Tuple of (stage1_results, stage2_results, stage3_result, metadata)
     """
+    # The run uses the same normalized query as its key, so it doesn't depend
+    # on which caller started it
+    user_query = user_query.strip()
+    key = _inflight_key(user_query, use_cache, council_config)
+    task = _inflight.get(key)
+    if task is None:
+        task = asyncio.ensure_future(_run_full_council(user_query, use_cache, council_config))
+        _inflight[key] = task
+        task.add_done_callback(lambda _: _inflight.pop(key, None))
+    else:
+        logger.info("Joining in-flight council run for identical query")
+
+    # Shielded so one caller cancelling doesn't cancel the run for the others
+    return copy.deepcopy(await asyncio.shield(task))
+
+
+async def _run_full_council(
+    user_query: str,
+    use_cache: bool,
+    council_config: Optional[Dict[str, Any]]
+) -> Tuple[List, List, Dict, Dict]:
+    """Run all three stages; see run_full_council."""
     # Check for cached complete result
     if use_cache:
         cached_result = await query_cache.get_cached_council_result(user_query)
         if cached_result:
-            logger.info("Using cached council result")
-            # Add cache hit to metadata
-            cached_result["metadata"]["cache_hit"] = True
-            cached_result["metadata"]["cost"] = 0.0
-            return (
-                cached_result["stage1"],
-                cached_result["stage2"],
-                cached_result["stage3"],
-                cached_result["metadata"]
-            )
+            return _fast_return_cached(cached_result)
 
-    # Track initial budget state
-    initial_spend = cost_tracker.current_spend
+    # Request-scoped tracker holding a reservation; settled with the ledger at the end
+    tracker = budget_ledger.new_tracker()
 
     try:
         # Stage 1: Collect individual responses with resilience
         stage1_results = await stage1_collect_responses(
             user_query,
-            council_config=council_config
+            council_config=council_config,
+            tracker=tracker
         )
 
         # If no models responded successfully, return error
@@ -512,23 +747,36 @@ async def run_full_council(
             return stage1_results, [], {
                 "model": "error",
                 "response": "Insufficient responses for ranking. Only one model responded."
-            }, {"error": "insufficient_responses", "cost": cost_tracker.current_spend - initial_spend}
+            }, {"error": "insufficient_responses", "cost": tracker.current_spend}
 
-        # Stage 2: Collect rankings
-        stage2_results, label_to_model = await stage2_collect_rankings(user_query, stage1_results)
+        # Stage 2: Collect rankings (blocks are shared with the Stage 3 prompt)
+        stage_blocks = build_stage_blocks(stage1_results)
+        stage2_results, label_to_model = await stage2_collect_rankings(
+            user_query, stage1_results, stage_blocks
+        )
 
         # Calculate aggregate rankings
         aggregate_rankings = calculate_aggregate_rankings(stage2_results, label_to_model)
 
-        # Stage 3: Synthesize final answer
-        stage3_result = await stage3_synthesize_final(
-            user_query,
-            stage1_results,
-            stage2_results
-        )
+        # Stage 3: Use a dominant winner directly, otherwise ask the chairman
+        winner = _dominant_winner(aggregate_rankings, stage2_results, label_to_model)
+        if winner is not None:
+            logger.info(f"Skipping chairman: {winner} is the clear peer-ranked winner")
+            stage3_result = {
+                "model": winner,
+                "response": next(text for _, model, text in stage_blocks if model == winner),
+                "direct": True
+            }
+        else:
+            stage3_result = await stage3_synthesize_final(
+                user_query,
+                stage1_results,
+                stage2_results,
+                stage_blocks
+            )
 
         # Calculate total cost
-        total_cost = cost_tracker.current_spend - initial_spend
+        total_cost = tracker.current_spend
 
         # Prepare metadata
         metadata = {
@@ -537,8 +785,9 @@ async def run_full_council(
             "cost": round(total_cost, 4),
             "cache_hit": False,
             "models_used": len(stage1_results),
-            "budget_remaining": cost_tracker.get_remaining_budget(),
-            "cache_stats": cache.get_stats()
+            "budget_remaining": budget_ledger.remaining_with(tracker),
+            "cache_stats": cache.get_stats(),
+            "chairman_skipped": winner is not None
         }
 
         # Cache the complete result
@@ -559,7 +808,7 @@ async def run_full_council(
         return [], [], {
             "model": "error",
             "response": str(e)
-        }, {"error": "budget_exceeded", "cost": cost_tracker.current_spend - initial_spend}
+        }, {"error": "budget_exceeded", "cost": tracker.current_spend}
 
     except Exception as e:
         # Unexpected errors
@@ -567,4 +816,7 @@ async def run_full_council(
         return [], [], {
             "model": "error",
             "response": f"An unexpected error occurred: {str(e)}"
-        }, {"error": "unexpected", "cost": cost_tracker.current_spend - initial_spend}
+        }, {"error": "unexpected", "cost": tracker.current_spend}
+
+    finally:
+        await budget_ledger.commit(tracker)
@@ -1,12 +1,32 @@
 """SQLite database for persistent settings and data storage."""
 
+import atexit
+import logging
 import os
+import queue
 import sqlite3
-import json
+import threading
+import time
+import orjson
 from datetime import datetime
-from typing import Dict, List, Any, Optional
+from itertools import groupby
+from operator import itemgetter
+from typing import Any, Callable, Dict, List, Optional, Tuple
 from contextlib import contextmanager
 
+logger = logging.getLogger(__name__)
+
+def _now_ms() -> int:
+    """Current time as integer unix epoch milliseconds."""
+    return time.time_ns() // 1_000_000
+
+def _dumps(value: Any) -> bytes:
+    """Serialize a JSON column value; the UTF-8 bytes are bound as a BLOB as-is."""
+    return orjson.dumps(value, option=orjson.OPT_NON_STR_KEYS)
+
+# Accepts BLOB (bytes) values as well as TEXT rows written by older versions
+_loads = orjson.loads
+
 # Database path
 DB_PATH = os.path.join(os.path.dirname(__file__), 'data', 'council.db')
 
@@ -14,157 +34,449 @@ def ensure_db_dir():
     """Ensure the data directory exists."""
     os.makedirs(os.path.dirname(DB_PATH), exist_ok=True)
 
-@contextmanager
-def get_connection():
-    """Get a database connection with context manager."""
+# WAL mode is persistent in the database file, so it is only switched on once
+_wal_initialized = False
+
+# Per-connection settings: NORMAL sync is safe under WAL and avoids an fsync per
+# commit; ~20MB page cache; wait on locks instead of failing with "database is locked".
+# foreign_keys stays off: execution logs are written before their conversation row.
+_CONNECTION_PRAGMAS = (
+    'PRAGMA synchronous=NORMAL',
+    'PRAGMA temp_store=MEMORY',
+    'PRAGMA cache_size=-20000',
+    'PRAGMA mmap_size=268435456',
+    'PRAGMA busy_timeout=5000',
+)
+
+def _configure_connection(conn: sqlite3.Connection):
+    """Apply journal mode (first open only) and per-connection PRAGMAs."""
+    global _wal_initialized
+    if not _wal_initialized:
+        conn.execute('PRAGMA journal_mode=WAL')
+        _wal_initialized = True
+    for pragma in _CONNECTION_PRAGMAS:
+        conn.execute(pragma)
+
+# Prepared statements kept per connection; writes below use module-level SQL
+# constants so every call hits the same cache entries
+_STATEMENT_CACHE_SIZE = 256
+
+# Idle connections kept open between calls so SQLite's page cache stays warm;
+# LIFO hands out the most recently used (hottest) connection first
+_POOL_SIZE = 8
+_pool: 'queue.LifoQueue[sqlite3.Connection]' = queue.LifoQueue(maxsize=_POOL_SIZE)
+
+def _open_connection() -> sqlite3.Connection:
+    """Open and configure a new connection (usable from any thread, one at a time)."""
     ensure_db_dir()
-    conn = sqlite3.connect(DB_PATH)
+    conn = sqlite3.connect(DB_PATH, check_same_thread=False, cached_statements=_STATEMENT_CACHE_SIZE)
     conn.row_factory = sqlite3.Row
+    _configure_connection(conn)
+    return conn
+
+@contextmanager
+def _pooled_connection():
+    """Borrow a pooled connection without checking the schema exists."""
+    try:
+        conn = _pool.get_nowait()
+    except queue.Empty:
+        conn = _open_connection()
     try:
         yield conn
     finally:
-        conn.close()
-
-def init_database():
-    """Initialize the database with required tables."""
-    with get_connection() as conn:
-        cursor = conn.cursor()
-
-        # Settings table for key-value storage
-        cursor.execute('''
-            CREATE TABLE IF NOT EXISTS settings (
-                key TEXT PRIMARY KEY,
-                value TEXT NOT NULL,
-                updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-            )
-        ''')
-
-        # Custom roles table
-        cursor.execute('''
-            CREATE TABLE IF NOT EXISTS custom_roles (
-                id TEXT PRIMARY KEY,
-                name TEXT NOT NULL,
-                description TEXT,
-                icon TEXT DEFAULT '🎭',
-                prompt TEXT,
-                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-            )
-        ''')
-
-        # Conversation history table
-        cursor.execute('''
-            CREATE TABLE IF NOT EXISTS conversations (
-                id TEXT PRIMARY KEY,
-                query TEXT NOT NULL,
-                config TEXT,
-                responses TEXT,
-                rankings TEXT,
-                final_answer TEXT,
-                total_tokens INTEGER DEFAULT 0,
-                total_cost REAL DEFAULT 0.0,
-                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-            )
-        ''')
-
-        # Add rankings column if it doesn't exist (migration for existing DBs)
+        # Uncommitted work is discarded, as closing the connection used to do
+        if conn.in_transaction:
+            conn.rollback()
         try:
-            cursor.execute('ALTER TABLE conversations ADD COLUMN rankings TEXT')
-        except sqlite3.OperationalError:
-            pass  # Column already exists
+            _pool.put_nowait(conn)
+        except queue.Full:
+            conn.close()
 
-        # Execution logs table for detailed interaction tracking
-        cursor.execute('''
-            CREATE TABLE IF NOT EXISTS execution_logs (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                conversation_id TEXT NOT NULL,
-                round_number INTEGER DEFAULT 1,
-                stage TEXT NOT NULL,
-                node_id TEXT,
-                node_name TEXT,
-                model TEXT,
-                role TEXT,
-                input_content TEXT,
-                output_content TEXT,
-                tokens_used INTEGER DEFAULT 0,
-                cost REAL DEFAULT 0.0,
-                duration_ms INTEGER DEFAULT 0,
-                timestamp TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                FOREIGN KEY (conversation_id) REFERENCES conversations(id)
-            )
-        ''')
+@contextmanager
+def get_connection():
+    """Borrow a pooled database connection with context manager."""
+    if not _initialized:
+        ensure_initialized()
+    with _pooled_connection() as conn:
+        yield conn
 
-        # Decision tree / flow tracking
-        cursor.execute('''
-            CREATE TABLE IF NOT EXISTS decision_tree (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                conversation_id TEXT NOT NULL,
-                round_number INTEGER DEFAULT 1,
-                parent_node_id TEXT,
-                node_id TEXT NOT NULL,
-                decision_type TEXT,
-                decision_data TEXT,
-                timestamp TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                FOREIGN KEY (conversation_id) REFERENCES conversations(id)
-            )
-        ''')
+def _dict_cursor(conn: sqlite3.Connection) -> sqlite3.Cursor:
+    """Cursor yielding plain tuples, for readers that build dicts with _fetch_dicts."""
+    cursor = conn.cursor()
+    cursor.row_factory = None
+    return cursor
+
+def _fetch_dicts(cursor: sqlite3.Cursor, json_columns: Tuple[str, ...] = ()) -> List[Dict]:
+    """Build result dicts straight from row tuples, decoding JSON columns ({} when empty)."""
+    columns = [d[0] for d in cursor.description]
+    decode = [(i, name) for i, name in enumerate(columns) if name in json_columns]
+    rows = []
+    for values in cursor:
+        row = dict(zip(columns, values))
+        for i, name in decode:
+            value = values[i]
+            row[name] = _loads(value) if value else {}
+        rows.append(row)
+    return rows
+
+def close_connections():
+    """Commit queued writes, then close all idle pooled connections."""
+    flush_writes()
+    while True:
+        try:
+            _pool.get_nowait().close()
+        except queue.Empty:
+            return
+
+# Full schema, created in one transaction by a single executescript
+_SCHEMA_SCRIPT = '''
+BEGIN;
+
+-- Settings table for key-value storage
+CREATE TABLE IF NOT EXISTS settings (
+    key TEXT PRIMARY KEY,
+    value TEXT NOT NULL,
+    value_type TEXT,
+    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+
+-- Custom roles table
+CREATE TABLE IF NOT EXISTS custom_roles (
+    id TEXT PRIMARY KEY,
+    name TEXT NOT NULL,
+    description TEXT,
+    icon TEXT DEFAULT '🎭',
+    prompt TEXT,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+
+-- Conversation history table (JSON columns are BLOBs; databases created
+-- with TEXT columns need no migration, bound bytes are stored as BLOBs)
+CREATE TABLE IF NOT EXISTS conversations (
+    id TEXT PRIMARY KEY,
+    query TEXT NOT NULL,
+    config BLOB,
+    responses BLOB,
+    rankings BLOB,
+    final_answer BLOB,
+    total_tokens INTEGER DEFAULT 0,
+    total_cost REAL DEFAULT 0.0,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+
+-- Execution logs table for detailed interaction tracking
+CREATE TABLE IF NOT EXISTS execution_logs (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    conversation_id TEXT NOT NULL,
+    round_number INTEGER DEFAULT 1,
+    stage TEXT NOT NULL,
+    node_id TEXT,
+    node_name TEXT,
+    model TEXT,
+    role TEXT,
+    input_content TEXT,
+    output_content TEXT,
+    tokens_used INTEGER DEFAULT 0,
+    cost REAL DEFAULT 0.0,
+    duration_ms INTEGER DEFAULT 0,
+    timestamp INTEGER DEFAULT (CAST((julianday('now') - 2440587.5) * 86400000 AS INTEGER)),
+    FOREIGN KEY (conversation_id) REFERENCES conversations(id)
+);
+
+-- Decision tree / flow tracking
+CREATE TABLE IF NOT EXISTS decision_tree (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    conversation_id TEXT NOT NULL,
+    round_number INTEGER DEFAULT 1,
+    parent_node_id TEXT,
+    node_id TEXT NOT NULL,
+    decision_type TEXT,
+    decision_data BLOB,
+    timestamp INTEGER DEFAULT (CAST((julianday('now') - 2440587.5) * 86400000 AS INTEGER)),
+    FOREIGN KEY (conversation_id) REFERENCES conversations(id)
+);
+
+-- Cached models from OpenRouter
+CREATE TABLE IF NOT EXISTS cached_models (
+    id TEXT PRIMARY KEY,
+    name TEXT NOT NULL,
+    provider TEXT,
+    tier TEXT,
+    context_length INTEGER,
+    pricing BLOB,
+    cached_at INTEGER DEFAULT (CAST((julianday('now') - 2440587.5) * 86400000 AS INTEGER))
+);
+
+-- Favourite models
+CREATE TABLE IF NOT EXISTS favourite_models (
+    model_id TEXT PRIMARY KEY,
+    added_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+
+-- Cascade conversation deletes to their logs and decisions. A trigger
+-- rather than ON DELETE CASCADE: it needs no table rebuild on existing
+-- databases, and foreign_keys stays off (logs precede their conversation)
+CREATE TRIGGER IF NOT EXISTS trg_conversations_cascade
+AFTER DELETE ON conversations
+BEGIN
+    DELETE FROM execution_logs WHERE conversation_id = OLD.id;
+    DELETE FROM decision_tree WHERE conversation_id = OLD.id;
+END;
+
+-- Indexes for the per-conversation log/tree lookups (which are also
+-- returned in index order) and the recent-conversations listing
+CREATE INDEX IF NOT EXISTS idx_exec_conv_round_ts
+ON execution_logs(conversation_id, round_number, timestamp);
+CREATE INDEX IF NOT EXISTS idx_dt_conv_round_ts
+ON decision_tree(conversation_id, round_number, timestamp);
+CREATE INDEX IF NOT EXISTS idx_conv_created
+ON conversations(created_at DESC);
+
+COMMIT;
+'''
+
+# Columns added after a table was first released (migrations for existing DBs)
+_MIGRATION_COLUMNS = (
+    'ALTER TABLE conversations ADD COLUMN rankings BLOB',
+    'ALTER TABLE settings ADD COLUMN value_type TEXT',  # NULL marks legacy rows
+)
 
-        # Cached models from OpenRouter
-        cursor.execute('''
-            CREATE TABLE IF NOT EXISTS cached_models (
-                id TEXT PRIMARY KEY,
-                name TEXT NOT NULL,
-                provider TEXT,
-                tier TEXT,
-                context_length INTEGER,
-                pricing TEXT,
-                cached_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-            )
-        ''')
+def init_database():
+    """Initialize the database with required tables."""
+    with _pooled_connection() as conn:
+        conn.executescript(_SCHEMA_SCRIPT)
 
-        # Favourite models
-        cursor.execute('''
-            CREATE TABLE IF NOT EXISTS favourite_models (
-                model_id TEXT PRIMARY KEY,
-                added_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-            )
-        ''')
+        for statement in _MIGRATION_COLUMNS:
+            try:
+                conn.execute(statement)
+            except sqlite3.OperationalError:
+                pass  # Column already exists
+
+        # Refresh planner statistics only where they are stale or missing
+        conn.execute('PRAGMA optimize')
+
+# Schema is created on first use rather than at import
+_initialized = False
+_init_lock = threading.Lock()
+
+def ensure_initialized():
+    """Run init_database once per process (safe to call from any thread)."""
+    global _initialized
+    if _initialized:
+        return
+    with _init_lock:
+        if not _initialized:
+            init_database()
+            _start_writer()
+            _initialized = True
+
+# === Background Writer ===
+# Log and decision inserts are queued and committed by one writer thread, which
+# gathers whatever arrives within a short window into a single transaction.
+# Readers of those tables call flush_writes() first, so they see every write
+# queued before the read (but don't wait for writes queued after it).
+
+_WRITE_QUEUE_SIZE = 10000
+_WRITE_BATCH_MAX = 500
+_WRITE_BATCH_WINDOW = 0.005  # seconds
+
+_write_queue: 'queue.Queue[Tuple[str, tuple]]' = queue.Queue(maxsize=_WRITE_QUEUE_SIZE)
+# Writes queued and writes finished (committed or dropped) so far; the writer
+# handles them in queue order, so _writes_done >= n means the first n are done
+_writes_queued = 0
+_writes_done = 0
+_writes_cond = threading.Condition()
+
+def _start_writer():
+    """Start the writer thread; queued writes are flushed at interpreter exit."""
+    threading.Thread(target=_writer_loop, name='db-writer', daemon=True).start()
+    atexit.register(flush_writes)
+
+def _next_batch() -> List[Tuple[str, tuple]]:
+    """Block for one queued write, then take whatever else arrives within the window."""
+    batch = [_write_queue.get()]
+    deadline = time.monotonic() + _WRITE_BATCH_WINDOW
+    while len(batch) < _WRITE_BATCH_MAX:
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            break
+        try:
+            batch.append(_write_queue.get(timeout=remaining))
+        except queue.Empty:
+            break
+    return batch
 
+def _write_batch(conn: sqlite3.Connection, batch: List[Tuple[str, tuple]]):
+    """Commit a batch in one transaction; if that fails, retry row by row so only bad rows are lost."""
+    try:
+        # Consecutive writes with the same SQL share one executemany, in queue order
+        for sql, group in groupby(batch, key=itemgetter(0)):
+            conn.executemany(sql, [params for _, params in group])
         conn.commit()
+        return
+    except sqlite3.Error as e:
+        conn.rollback()
+        logger.warning(f"Batch of {len(batch)} queued writes failed ({e}), retrying row by row")
+
+    for sql, params in batch:
+        try:
+            conn.execute(sql, params)
+        except sqlite3.Error as e:
+            logger.error(f"Dropped queued database write: {e}")
+    conn.commit()
+
+def _writer_loop():
+    """Commit queued writes in batches, one transaction per batch."""
+    global _writes_done
+    while True:
+        batch = _next_batch()
+        try:
+            with _pooled_connection() as conn:
+                _write_batch(conn, batch)
+        except Exception as e:
+            logger.error(f"Dropped {len(batch)} queued database writes: {e}")
+        finally:
+            with _writes_cond:
+                _writes_done += len(batch)
+                _writes_cond.notify_all()
+
+# Values sqlite3 binds natively (bool is an int subclass)
+_BINDABLE_TYPES = (str, int, float, bytes)
+
+def _enqueue_writes(sql: str, rows: List[tuple]):
+    """Queue writes for the writer thread without blocking.
+
+    Unbindable values raise TypeError here, to the caller, before any row is
+    queued, rather than failing later in the writer. When the queue is full the
+    remaining writes are dropped and logged: these are diagnostic logs, and
+    blocking would stall the event loop.
+    """
+    global _writes_queued
+    for params in rows:
+        for value in params:
+            if value is not None and not isinstance(value, _BINDABLE_TYPES):
+                raise TypeError(f"Cannot store {type(value).__name__} value in the database")
+    if not _initialized:
+        ensure_initialized()
+    # Counting under the lock keeps the count in step with the queue order
+    with _writes_cond:
+        for i, params in enumerate(rows):
+            try:
+                _write_queue.put_nowait((sql, params))
+            except queue.Full:
+                logger.warning(f"Database write queue full ({_WRITE_QUEUE_SIZE}), "
+                               f"dropping {len(rows) - i} writes")
+                return
+            _writes_queued += 1
+
+def _enqueue_write(sql: str, params: tuple):
+    """Queue one write for the writer thread (see _enqueue_writes)."""
+    _enqueue_writes(sql, (params,))
+
+def flush_writes():
+    """Wait until every write queued before this call has been committed."""
+    with _writes_cond:
+        target = _writes_queued
+        _writes_cond.wait_for(lambda: _writes_done >= target)
 
 # === Settings Operations ===
 
+_SQL_SELECT_SETTING = 'SELECT value_type, value FROM settings WHERE key = ?'
+
+# Updates an existing row in place rather than deleting and reinserting it
+_SQL_UPSERT_SETTING = '''
+    INSERT INTO settings (key, value, value_type, updated_at)
+    VALUES (?, ?, ?, CURRENT_TIMESTAMP)
+    ON CONFLICT(key) DO UPDATE SET
+        value = excluded.value,
+        value_type = excluded.value_type,
+        updated_at = CURRENT_TIMESTAMP
+'''
+
+# Scalars are stored as their text form under a value_type tag and skip JSON;
+# anything else (including subclasses such as enums) is stored as 'json'
+_SETTING_ENCODERS = {
+    str: ('str', lambda value: value),
+    bool: ('bool', lambda value: '1' if value else '0'),
+    int: ('int', str),
+    float: ('float', repr),
+    type(None): ('null', lambda value: ''),
+}
+
+def _decode_legacy_setting(raw: str) -> Any:
+    """Decode a row written before value_type existed."""
+    try:
+        return _loads(raw)
+    except orjson.JSONDecodeError:
+        # Plain strings stored verbatim
+        return raw
+
+_SETTING_DECODERS = {
+    'str': lambda raw: raw,
+    'bool': lambda raw: raw == '1',
+    'int': int,
+    'float': float,
+    'null': lambda raw: None,
+    'json': _loads,
+    None: _decode_legacy_setting,
+}
+
+# (expires_at, stored) by key, where stored is a (value_type, raw value) pair or
+# _MISSING. set_setting writes through, so this process sees its own writes at
+# once; entries expire after _SETTING_CACHE_TTL so writes from other processes
+# (several uvicorn workers, or another app on the same file) show up within
+# that time. The lock stops a slow miss from caching a value older than a
+# concurrent write. Values are decoded on every read, so callers never share a
+# mutable cached object.
+_SETTING_CACHE_TTL = 5.0  # seconds
+_MISSING = object()
+_setting_cache: Dict[str, Tuple[float, Any]] = {}
+_cache_lock = threading.RLock()
+
 def get_setting(key: str, default: Any = None) -> Any:
     """Get a setting value."""
-    with get_connection() as conn:
-        cursor = conn.cursor()
-        cursor.execute('SELECT value FROM settings WHERE key = ?', (key,))
-        row = cursor.fetchone()
-        if row:
-            try:
-                return json.loads(row['value'])
-            except json.JSONDecodeError:
-                return row['value']
+    now = time.monotonic()
+    entry = _setting_cache.get(key)
+    if entry is None or entry[0] <= now:
+        with _cache_lock:
+            entry = _setting_cache.get(key)
+            if entry is None or entry[0] <= now:
+                with get_connection() as conn:
+                    cursor = conn.cursor()
+                    cursor.execute(_SQL_SELECT_SETTING, (key,))
+                    row = cursor.fetchone()
+                stored = (row['value_type'], row['value']) if row else _MISSING
+                entry = _setting_cache[key] = (now + _SETTING_CACHE_TTL, stored)
+    stored = entry[1]
+    if stored is _MISSING:
         return default
+    value_type, raw = stored
+    return _SETTING_DECODERS.get(value_type, _decode_legacy_setting)(raw)
 
 def set_setting(key: str, value: Any):
     """Set a setting value."""
-    with get_connection() as conn:
-        cursor = conn.cursor()
-        json_value = json.dumps(value) if not isinstance(value, str) else value
-        cursor.execute('''
-            INSERT OR REPLACE INTO settings (key, value, updated_at)
-            VALUES (?, ?, CURRENT_TIMESTAMP)
-        ''', (key, json_value))
-        conn.commit()
+    encoder = _SETTING_ENCODERS.get(type(value))
+    if encoder is not None:
+        value_type, encode = encoder
+        raw = encode(value)
+    else:
+        value_type, raw = 'json', _dumps(value).decode()
+    with _cache_lock:
+        with get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute(_SQL_UPSERT_SETTING, (key, raw, value_type))
+            conn.commit()
+        _setting_cache[key] = (time.monotonic() + _SETTING_CACHE_TTL, (value_type, raw))
 
 # === Custom Roles Operations ===
 
 def get_custom_roles() -> List[Dict]:
     """Get all custom roles."""
     with get_connection() as conn:
-        cursor = conn.cursor()
-        cursor.execute('SELECT * FROM custom_roles ORDER BY created_at DESC')
-        return [dict(row) for row in cursor.fetchall()]
+        cursor = _dict_cursor(conn)
+        cursor.execute('SELECT id, name, description, icon, prompt, created_at '
+                       'FROM custom_roles ORDER BY created_at DESC')
+        return _fetch_dicts(cursor)
 
 def add_custom_role(role: Dict) -> str:
     """Add a custom role."""
@@ -187,101 +499,175 @@ def delete_custom_role(role_id: str):
 
 # === Conversation Operations ===
 
+# Updated in place (a REPLACE would delete the row first); re-saving still moves
+# the conversation to the top of the recent list, as REPLACE did
+_SQL_SAVE_CONVERSATION = '''
+    INSERT INTO conversations
+    (id, query, config, responses, rankings, final_answer, total_tokens, total_cost)
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+    ON CONFLICT(id) DO UPDATE SET
+        query = excluded.query,
+        config = excluded.config,
+        responses = excluded.responses,
+        rankings = excluded.rankings,
+        final_answer = excluded.final_answer,
+        total_tokens = excluded.total_tokens,
+        total_cost = excluded.total_cost,
+        created_at = CURRENT_TIMESTAMP
+'''
+
 def save_conversation(conv: Dict) -> str:
     """Save or update a conversation."""
     with get_connection() as conn:
         cursor = conn.cursor()
-        cursor.execute('''
-            INSERT OR REPLACE INTO conversations
-            (id, query, config, responses, rankings, final_answer, total_tokens, total_cost)
-            VALUES (?, ?, ?, ?, ?, ?, ?, ?)
-        ''', (
+        cursor.execute(_SQL_SAVE_CONVERSATION, (
             conv['id'],
             conv['query'],
-            json.dumps(conv.get('config', {})),
-            json.dumps(conv.get('responses', {})),
-            json.dumps(conv.get('rankings', {})),
-            json.dumps(conv.get('final_answer', {})),
+            _dumps(conv.get('config', {})),
+            _dumps(conv.get('responses', {})),
+            _dumps(conv.get('rankings', {})),
+            _dumps(conv.get('final_answer', {})),
             conv.get('total_tokens', conv.get('tokens', 0)),
             conv.get('total_cost', conv.get('cost', 0.0))
         ))
         conn.commit()
         return conv['id']
 
+# Columns for list views; the JSON payloads are only read for full rows
+_CONVERSATION_SUMMARY_COLUMNS = 'id, query, total_tokens, total_cost, created_at'
+_CONVERSATION_COLUMNS = (
+    'id, query, config, responses, rankings, final_answer, total_tokens, total_cost, created_at'
+)
+_CONVERSATION_JSON_COLUMNS = ('config', 'responses', 'rankings', 'final_answer')
+
 def get_conversations(limit: int = 50) -> List[Dict]:
     """Get recent conversations."""
     with get_connection() as conn:
-        cursor = conn.cursor()
-        cursor.execute('''
-            SELECT * FROM conversations ORDER BY created_at DESC LIMIT ?
+        cursor = _dict_cursor(conn)
+        cursor.execute(f'''
+            SELECT {_CONVERSATION_COLUMNS} FROM conversations ORDER BY created_at DESC LIMIT ?
+        ''', (limit,))
+        return _fetch_dicts(cursor, _CONVERSATION_JSON_COLUMNS)
+
+def get_conversations_summary(limit: int = 50) -> List[Dict]:
+    """Get recent conversations without their config/response payloads."""
+    with get_connection() as conn:
+        cursor = _dict_cursor(conn)
+        cursor.execute(f'''
+            SELECT {_CONVERSATION_SUMMARY_COLUMNS} FROM conversations ORDER BY created_at DESC LIMIT ?
         ''', (limit,))
-        conversations = []
-        for row in cursor.fetchall():
-            conv = dict(row)
-            conv['config'] = json.loads(conv['config']) if conv['config'] else {}
-            conv['responses'] = json.loads(conv['responses']) if conv['responses'] else {}
-            conv['rankings'] = json.loads(conv['rankings']) if conv.get('rankings') else {}
-            conv['final_answer'] = json.loads(conv['final_answer']) if conv['final_answer'] else {}
-            conversations.append(conv)
-        return conversations
+        return _fetch_dicts(cursor)
+
+def get_conversation(conv_id: str) -> Optional[Dict]:
+    """Get one full conversation."""
+    with get_connection() as conn:
+        cursor = _dict_cursor(conn)
+        cursor.execute(f'SELECT {_CONVERSATION_COLUMNS} FROM conversations WHERE id = ?', (conv_id,))
+        rows = _fetch_dicts(cursor, _CONVERSATION_JSON_COLUMNS)
+        return rows[0] if rows else None
 
 def delete_conversation(conv_id: str):
     """Delete a conversation and its logs."""
+    flush_writes()
     with get_connection() as conn:
         cursor = conn.cursor()
-        cursor.execute('DELETE FROM execution_logs WHERE conversation_id = ?', (conv_id,))
-        cursor.execute('DELETE FROM decision_tree WHERE conversation_id = ?', (conv_id,))
+        # Logs and decisions go with it (trg_conversations_cascade)
         cursor.execute('DELETE FROM conversations WHERE id = ?', (conv_id,))
         conn.commit()
 
+# === INSERT statements ===
+# Insertable tables are described once as (column, default, encoder) fields;
+# their INSERT statement and each record's bind values are derived from that.
+# Defaults match the column DEFAULTs (NULL for None).
+
+_REQUIRED = object()  # No default: the record must supply the key
+_NOW = object()  # Defaults to _now_ms() when the row is built
+
+def _insert_sql(table: str, fields: Tuple[tuple, ...]) -> str:
+    """INSERT statement binding every field's column in order."""
+    columns = [field[0] for field in fields]
+    return f"INSERT INTO {table} ({', '.join(columns)}) VALUES ({', '.join('?' * len(columns))})"
+
+def _field_value(record: Dict, column: str, default: Any, encoder: Optional[Callable]) -> Any:
+    """Bind value for one field of a record."""
+    if default is _REQUIRED:
+        value = record[column]
+    elif default is _NOW:
+        value = record.get(column) or _now_ms()
+    else:
+        value = record.get(column, default)
+    return value if encoder is None else encoder(value)
+
+def _build_row(fields: Tuple[tuple, ...], record: Dict) -> tuple:
+    """Bind values for one record, in field order."""
+    return tuple(_field_value(record, *field) for field in fields)
+
 # === Execution Logging Operations ===
 
-def log_execution(log: Dict):
-    """Log an execution step."""
-    with get_connection() as conn:
-        cursor = conn.cursor()
-        cursor.execute('''
-            INSERT INTO execution_logs
-            (conversation_id, round_number, stage, node_id, node_name, model, role,
-             input_content, output_content, tokens_used, cost, duration_ms)
-            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-        ''', (
-            log['conversation_id'],
-            log.get('round_number', 1),
-            log['stage'],
-            log.get('node_id'),
-            log.get('node_name'),
-            log.get('model'),
-            log.get('role'),
-            log.get('input_content'),
-            log.get('output_content'),
-            log.get('tokens_used', 0),
-            log.get('cost', 0.0),
-            log.get('duration_ms', 0)
-        ))
-        conn.commit()
-        return cursor.lastrowid
+_EXECUTION_LOG_FIELDS = (
+    ('conversation_id', _REQUIRED, None),
+    ('round_number', 1, None),
+    ('stage', _REQUIRED, None),
+    ('node_id', None, None),
+    ('node_name', None, None),
+    ('model', None, None),
+    ('role', None, None),
+    ('input_content', None, None),
+    ('output_content', None, None),
+    ('tokens_used', 0, None),
+    ('cost', 0.0, None),
+    ('duration_ms', 0, None),
+    ('timestamp', _NOW, None),
+)
+_SQL_INSERT_EXEC_LOG = _insert_sql('execution_logs', _EXECUTION_LOG_FIELDS)
 
-def get_execution_logs(conversation_id: str, round_number: Optional[int] = None) -> List[Dict]:
-    """Get execution logs for a conversation."""
+def log_execution(log: Dict):
+    """Queue an execution step for logging (committed by the writer thread)."""
+    _enqueue_write(_SQL_INSERT_EXEC_LOG, _build_row(_EXECUTION_LOG_FIELDS, log))
+
+def log_executions(logs: List[Dict]):
+    """Queue several execution steps; the writer commits them together."""
+    _enqueue_writes(_SQL_INSERT_EXEC_LOG, [_build_row(_EXECUTION_LOG_FIELDS, log) for log in logs])
+
+# Summary rows leave out the (potentially large) prompt and output text
+_EXECUTION_LOG_SUMMARY_COLUMNS = (
+    'id, conversation_id, round_number, stage, node_id, node_name, model, role, '
+    'tokens_used, cost, duration_ms, timestamp'
+)
+_EXECUTION_LOG_COLUMNS = (
+    'id, conversation_id, round_number, stage, node_id, node_name, model, role, '
+    'input_content, output_content, tokens_used, cost, duration_ms, timestamp'
+)
+
+def get_execution_logs(conversation_id: str, round_number: Optional[int] = None,
+                       offset: int = 0, limit: Optional[int] = None,
+                       summary: bool = False) -> List[Dict]:
+    """Get execution logs for a conversation, optionally one page of them."""
+    columns = _EXECUTION_LOG_SUMMARY_COLUMNS if summary else _EXECUTION_LOG_COLUMNS
+    # id breaks timestamp ties so pages are stable; the index already ends in rowid
+    page = (-1 if limit is None else limit, offset)
+    flush_writes()
     with get_connection() as conn:
-        cursor = conn.cursor()
+        cursor = _dict_cursor(conn)
         if round_number is not None:
-            cursor.execute('''
-                SELECT * FROM execution_logs
+            cursor.execute(f'''
+                SELECT {columns} FROM execution_logs
                 WHERE conversation_id = ? AND round_number = ?
-                ORDER BY timestamp ASC
-            ''', (conversation_id, round_number))
+                ORDER BY timestamp ASC, id ASC
+                LIMIT ? OFFSET ?
+            ''', (conversation_id, round_number, *page))
         else:
-            cursor.execute('''
-                SELECT * FROM execution_logs
+            cursor.execute(f'''
+                SELECT {columns} FROM execution_logs
                 WHERE conversation_id = ?
-                ORDER BY round_number ASC, timestamp ASC
-            ''', (conversation_id,))
-        return [dict(row) for row in cursor.fetchall()]
+                ORDER BY round_number ASC, timestamp ASC, id ASC
+                LIMIT ? OFFSET ?
+            ''', (conversation_id, *page))
+        return _fetch_dicts(cursor)
 
 def get_rounds_for_conversation(conversation_id: str) -> List[int]:
     """Get all round numbers for a conversation."""
+    flush_writes()
     with get_connection() as conn:
         cursor = conn.cursor()
         cursor.execute('''
@@ -293,82 +679,88 @@ def get_rounds_for_conversation(conversation_id: str) -> List[int]:
 
 # === Decision Tree Operations ===
 
+# An empty decision_data is left NULL by single-row inserts; both read back as {}
+_DECISION_FIELDS = (
+    ('conversation_id', _REQUIRED, None),
+    ('round_number', 1, None),
+    ('parent_node_id', None, None),
+    ('node_id', _REQUIRED, None),
+    ('decision_type', None, None),
+    ('decision_data', {}, _dumps),
+    ('timestamp', _NOW, None),
+)
+_SQL_INSERT_DECISION = _insert_sql('decision_tree', _DECISION_FIELDS)
+
 def log_decision(decision: Dict):
-    """Log a decision in the tree."""
-    with get_connection() as conn:
-        cursor = conn.cursor()
-        cursor.execute('''
-            INSERT INTO decision_tree
-            (conversation_id, round_number, parent_node_id, node_id, decision_type, decision_data)
-            VALUES (?, ?, ?, ?, ?, ?)
-        ''', (
-            decision['conversation_id'],
-            decision.get('round_number', 1),
-            decision.get('parent_node_id'),
-            decision['node_id'],
-            decision.get('decision_type'),
-            json.dumps(decision.get('decision_data', {}))
-        ))
-        conn.commit()
-        return cursor.lastrowid
+    """Queue a decision in the tree (committed by the writer thread)."""
+    _enqueue_write(_SQL_INSERT_DECISION, _build_row(_DECISION_FIELDS, decision))
+
+def log_decisions(decisions: List[Dict]):
+    """Queue several decisions; the writer commits them together."""
+    _enqueue_writes(_SQL_INSERT_DECISION, [_build_row(_DECISION_FIELDS, decision) for decision in decisions])
+
+_DECISION_COLUMNS = (
+    'id, conversation_id, round_number, parent_node_id, node_id, '
+    'decision_type, decision_data, timestamp'
+)
 
 def get_decision_tree(conversation_id: str, round_number: Optional[int] = None) -> List[Dict]:
     """Get decision tree for a conversation."""
+    flush_writes()
     with get_connection() as conn:
-        cursor = conn.cursor()
+        cursor = _dict_cursor(conn)
         if round_number is not None:
-            cursor.execute('''
-                SELECT * FROM decision_tree
+            cursor.execute(f'''
+                SELECT {_DECISION_COLUMNS} FROM decision_tree
                 WHERE conversation_id = ? AND round_number = ?
                 ORDER BY timestamp ASC
             ''', (conversation_id, round_number))
         else:
-            cursor.execute('''
-                SELECT * FROM decision_tree
+            cursor.execute(f'''
+                SELECT {_DECISION_COLUMNS} FROM decision_tree
                 WHERE conversation_id = ?
                 ORDER BY round_number ASC, timestamp ASC
             ''', (conversation_id,))
-        trees = []
-        for row in cursor.fetchall():
-            tree = dict(row)
-            tree['decision_data'] = json.loads(tree['decision_data']) if tree['decision_data'] else {}
-            trees.append(tree)
-        return trees
+        return _fetch_dicts(cursor, ('decision_data',))
 
 # === Cached Models Operations ===
 
+_SQL_INSERT_CACHED_MODEL = '''
+    INSERT INTO cached_models (id, name, provider, tier, context_length, pricing, cached_at)
+    VALUES (?, ?, ?, ?, ?, ?, ?)
+'''
+
 def cache_models(models: List[Dict]):
     """Cache models from OpenRouter."""
     with get_connection() as conn:
         cursor = conn.cursor()
+        # Take the write lock up front; the clear and refill commit together
+        cursor.execute('BEGIN IMMEDIATE')
         # Clear existing cache
         cursor.execute('DELETE FROM cached_models')
-        # Insert new models
-        for model in models:
-            cursor.execute('''
-                INSERT INTO cached_models (id, name, provider, tier, context_length, pricing)
-                VALUES (?, ?, ?, ?, ?, ?)
-            ''', (
+        # Insert new models in one bulk call
+        cached_at = _now_ms()
+        cursor.executemany(_SQL_INSERT_CACHED_MODEL, (
+            (
                 model['id'],
                 model['name'],
                 model.get('provider', ''),
                 model.get('tier', 'standard'),
                 model.get('context_length', 0),
-                json.dumps(model.get('pricing', {}))
-            ))
+                _dumps(model.get('pricing', {})),
+                cached_at
+            )
+            for model in models
+        ))
         conn.commit()
 
 def get_cached_models() -> List[Dict]:
     """Get cached models."""
     with get_connection() as conn:
-        cursor = conn.cursor()
-        cursor.execute('SELECT * FROM cached_models ORDER BY provider, name')
-        models = []
-        for row in cursor.fetchall():
-            model = dict(row)
-            model['pricing'] = json.loads(model['pricing']) if model['pricing'] else {}
-            models.append(model)
-        return models
+        cursor = _dict_cursor(conn)
+        cursor.execute('SELECT id, name, provider, tier, context_length, pricing, cached_at '
+                       'FROM cached_models ORDER BY provider, name')
+        return _fetch_dicts(cursor, ('pricing',))
 
 def get_cache_age() -> Optional[datetime]:
     """Get when models were last cached."""
@@ -376,34 +768,51 @@ def get_cache_age() -> Optional[datetime]:
         cursor = conn.cursor()
         cursor.execute('SELECT MAX(cached_at) as cached_at FROM cached_models')
         row = cursor.fetchone()
-        if row and row['cached_at']:
-            return datetime.fromisoformat(row['cached_at'])
+        # Rows cached before timestamps became epoch millis read as stale
+        if row and isinstance(row['cached_at'], int):
+            return datetime.fromtimestamp(row['cached_at'] / 1000)
         return None
 
 # === Favourite Models Operations ===
 
+# (expires_at, favourite ids newest first); None until loaded and after every
+# change. Expires like _setting_cache so other processes' changes show up.
+_favourites_cache: Optional[Tuple[float, tuple]] = None
+
 def get_favourite_models() -> List[str]:
     """Get favourite model IDs."""
-    with get_connection() as conn:
-        cursor = conn.cursor()
-        cursor.execute('SELECT model_id FROM favourite_models ORDER BY added_at DESC')
-        return [row['model_id'] for row in cursor.fetchall()]
+    global _favourites_cache
+    now = time.monotonic()
+    entry = _favourites_cache
+    if entry is None or entry[0] <= now:
+        with _cache_lock:
+            entry = _favourites_cache
+            if entry is None or entry[0] <= now:
+                with get_connection() as conn:
+                    cursor = conn.cursor()
+                    cursor.execute('SELECT model_id FROM favourite_models ORDER BY added_at DESC')
+                    favourites = tuple(row['model_id'] for row in cursor.fetchall())
+                entry = _favourites_cache = (now + _SETTING_CACHE_TTL, favourites)
+    return list(entry[1])
 
 def add_favourite_model(model_id: str):
     """Add a favourite model."""
-    with get_connection() as conn:
-        cursor = conn.cursor()
-        cursor.execute('''
-            INSERT OR IGNORE INTO favourite_models (model_id) VALUES (?)
-        ''', (model_id,))
-        conn.commit()
+    global _favourites_cache
+    with _cache_lock:
+        with get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute('''
+                INSERT OR IGNORE INTO favourite_models (model_id) VALUES (?)
+            ''', (model_id,))
+            conn.commit()
+        _favourites_cache = None
 
 def remove_favourite_model(model_id: str):
     """Remove a favourite model."""
-    with get_connection() as conn:
-        cursor = conn.cursor()
-        cursor.execute('DELETE FROM favourite_models WHERE model_id = ?', (model_id,))
-        conn.commit()
-
-# Initialize database on module load
-init_database()
+    global _favourites_cache
+    with _cache_lock:
+        with get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute('DELETE FROM favourite_models WHERE model_id = ?', (model_id,))
+            conn.commit()
+        _favourites_cache = None
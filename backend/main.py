@@ -2,26 +2,31 @@
 
 import os
 import logging
+import re
 import sys
 import json
 import asyncio
 import uuid
 import time
+import orjson
+from contextlib import aclosing, asynccontextmanager
+from cachetools import TTLCache
 from datetime import datetime, timedelta
 from dotenv import load_dotenv
 from fastapi import FastAPI, HTTPException, WebSocket, WebSocketDisconnect
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse
 from pydantic import BaseModel
 from typing import List, Dict, Any, Optional
 
 try:
-    from .openrouter import query_model, query_models_parallel, fetch_available_models
-    from .config import COUNCIL_MODELS, CHAIRMAN_MODEL, MODEL_PROVIDERS, MODEL_PRICING
+    from .openrouter import query_model, query_models_parallel, stream_model, fetch_available_models, get_client, close_client
+    from .config import COUNCIL_MODELS, CHAIRMAN_MODEL, MODEL_PROVIDERS, MODEL_TOKEN_PRICES
     from . import database as db
     from . import reasoning_patterns as patterns
 except ImportError:
-    from openrouter import query_model, query_models_parallel, fetch_available_models
-    from config import COUNCIL_MODELS, CHAIRMAN_MODEL, MODEL_PROVIDERS, MODEL_PRICING
+    from openrouter import query_model, query_models_parallel, stream_model, fetch_available_models, get_client, close_client
+    from config import COUNCIL_MODELS, CHAIRMAN_MODEL, MODEL_PROVIDERS, MODEL_TOKEN_PRICES
     import database as db
     import reasoning_patterns as patterns
 
@@ -42,7 +47,61 @@ logging.basicConfig(
 
 logger = logging.getLogger(__name__)
 
-app = FastAPI(title="AI Council API - Visual Builder")
+
+async def _db(fn, *args, **kwargs):
+    """Run a blocking database call in a worker thread so it doesn't stall the event loop.
+
+    Only the queued log writes, which never touch the database on the
+    caller's thread, are called inline.
+    """
+    return await asyncio.to_thread(fn, *args, **kwargs)
+
+
+# "1. Response A" lines of a stage 2 ranking, compiled once (council.py's
+# _NUMBERED_RANK_RE is a different, looser pattern)
+_RANKED_LABEL_RE = re.compile(r'\d+\.\s*Response [A-Z]')
+
+
+def _scan_response_labels(text: str) -> List[str]:
+    """Find every "Response X" label (X uppercase) with a str.find loop."""
+    labels = []
+    find = text.find
+    end = len(text) - 9
+    i = find("Response ")
+    while 0 <= i < end:
+        c = text[i + 9]
+        if "A" <= c <= "Z":
+            labels.append("Response " + c)
+            i = find("Response ", i + 10)
+        else:
+            i = find("Response ", i + 9)
+    return labels
+
+
+def _json_bytes(content: Any) -> bytes:
+    """Serialize a response or WebSocket payload with orjson."""
+    return orjson.dumps(content, option=orjson.OPT_NON_STR_KEYS)
+
+
+class OrjsonResponse(JSONResponse):
+    """JSONResponse rendered with orjson (FastAPI's ORJSONResponse is deprecated)."""
+
+    def render(self, content: Any) -> bytes:
+        return _json_bytes(content)
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Create the database schema and HTTP client before serving; release both on shutdown."""
+    db.ensure_initialized()
+    get_client()
+    yield
+    await close_client()
+    db.close_connections()
+
+
+app = FastAPI(title="AI Council API - Visual Builder", lifespan=lifespan,
+              default_response_class=OrjsonResponse)
 
 logger.info(f"🏛️ AI Council API starting on port {PORT}...")
 
@@ -146,6 +205,16 @@ AVAILABLE_ROLES = [
      "prompt": "You are the Chairman of an AI Council. Synthesize all inputs into a comprehensive final answer that represents the council's collective wisdom."},
 ]
 
+# Role id -> system prompt; unknown roles fall back to the primary responder
+_ROLE_PROMPTS = {r["id"]: r["prompt"] for r in AVAILABLE_ROLES}
+_DEFAULT_ROLE_PROMPT = AVAILABLE_ROLES[0]["prompt"]
+
+# In-process caches for the read-mostly endpoints the frontend polls. The models
+# TTL stays well inside the 24h database refresh window so an expired model list
+# is never served from memory; roles are also cleared whenever they change.
+_MODELS_CACHE: TTLCache = TTLCache(maxsize=1, ttl=300)
+_ROLES_CACHE: TTLCache = TTLCache(maxsize=1, ttl=300)
+
 
 # === REST Endpoints ===
 
@@ -158,15 +227,22 @@ async def root():
 @app.get("/api/models")
 async def list_models(refresh: bool = False):
     """List available AI models with caching."""
+    if not refresh:
+        cached_response = _MODELS_CACHE.get("models")
+        if cached_response is not None:
+            return cached_response
+
     # Check cache age (refresh if older than 24 hours or forced)
-    cache_age = db.get_cache_age()
+    cache_age = await _db(db.get_cache_age)
     should_refresh = refresh or cache_age is None or (datetime.now() - cache_age) > timedelta(hours=24)
 
     if not should_refresh:
-        cached = db.get_cached_models()
+        cached = await _db(db.get_cached_models)
         if cached:
             logger.info(f"Returning {len(cached)} cached models")
-            return {"models": cached, "cached": True, "cache_age": cache_age.isoformat() if cache_age else None}
+            response = {"models": cached, "cached": True, "cache_age": cache_age.isoformat() if cache_age else None}
+            _MODELS_CACHE["models"] = response
+            return response
 
     # Fetch fresh models from OpenRouter
     logger.info("Fetching models from OpenRouter API...")
@@ -174,7 +250,7 @@ async def list_models(refresh: bool = False):
 
     if not raw_models:
         # Fall back to cache or static list
-        cached = db.get_cached_models()
+        cached = await _db(db.get_cached_models)
         if cached:
             return {"models": cached, "cached": True, "error": "Failed to fetch fresh models"}
         return {"models": AVAILABLE_MODELS, "cached": False, "error": "Using static fallback"}
@@ -216,18 +292,22 @@ async def list_models(refresh: bool = False):
     models.sort(key=lambda x: (x['provider'], x['name']))
 
     # Cache the models
-    db.cache_models(models)
+    await _db(db.cache_models, models)
     logger.info(f"Cached {len(models)} models from OpenRouter")
 
-    return {"models": models, "cached": False}
+    response = {"models": models, "cached": False}
+    _MODELS_CACHE["models"] = response
+    return response
 
 
 @app.get("/api/roles")
 async def list_roles():
     """List available participant roles including custom roles."""
-    custom_roles = db.get_custom_roles()
-    all_roles = AVAILABLE_ROLES + custom_roles
-    return {"roles": all_roles}
+    response = _ROLES_CACHE.get("all")
+    if response is None:
+        custom_roles = await _db(db.get_custom_roles)
+        response = _ROLES_CACHE["all"] = {"roles": AVAILABLE_ROLES + custom_roles}
+    return response
 
 
 @app.post("/api/roles")
@@ -235,7 +315,8 @@ async def create_role(role: Dict[str, Any]):
     """Create a custom role."""
     role_id = role.get('id') or f"custom_{uuid.uuid4().hex[:8]}"
     role['id'] = role_id
-    db.add_custom_role(role)
+    await _db(db.add_custom_role, role)
+    _ROLES_CACHE.clear()
     logger.info(f"Created custom role: {role['name']}")
     return {"id": role_id, "success": True}
 
@@ -243,7 +324,8 @@ async def create_role(role: Dict[str, Any]):
 @app.delete("/api/roles/{role_id}")
 async def delete_role(role_id: str):
     """Delete a custom role."""
-    db.delete_custom_role(role_id)
+    await _db(db.delete_custom_role, role_id)
+    _ROLES_CACHE.clear()
     logger.info(f"Deleted custom role: {role_id}")
     return {"success": True}
 
@@ -283,13 +365,13 @@ async def execute_council(request: ExecuteRequest):
 @app.get("/api/favourites")
 async def get_favourites():
     """Get favourite model IDs."""
-    return {"favourites": db.get_favourite_models()}
+    return {"favourites": await _db(db.get_favourite_models)}
 
 
 @app.post("/api/favourites/{model_id:path}")
 async def add_favourite(model_id: str):
     """Add a model to favourites."""
-    db.add_favourite_model(model_id)
+    await _db(db.add_favourite_model, model_id)
     logger.info(f"Added favourite: {model_id}")
     return {"success": True}
 
@@ -297,7 +379,7 @@ async def add_favourite(model_id: str):
 @app.delete("/api/favourites/{model_id:path}")
 async def remove_favourite(model_id: str):
     """Remove a model from favourites."""
-    db.remove_favourite_model(model_id)
+    await _db(db.remove_favourite_model, model_id)
     logger.info(f"Removed favourite: {model_id}")
     return {"success": True}
 
@@ -308,14 +390,15 @@ async def remove_favourite(model_id: str):
 async def get_all_settings():
     """Get all settings."""
     keys = ['defaultModel', 'defaultTemperature', 'theme', 'autoSave']
-    settings = {k: db.get_setting(k) for k in keys}
+    values = await _db(lambda: [db.get_setting(k) for k in keys])
+    settings = dict(zip(keys, values))
     return {"settings": settings}
 
 
 @app.get("/api/settings/{key}")
 async def get_setting(key: str):
     """Get a specific setting."""
-    value = db.get_setting(key)
+    value = await _db(db.get_setting, key)
     return {"key": key, "value": value}
 
 
@@ -323,7 +406,7 @@ async def get_setting(key: str):
 async def set_setting(key: str, body: Dict[str, Any]):
     """Set a setting value."""
     value = body.get('value')
-    db.set_setting(key, value)
+    await _db(db.set_setting, key, value)
     logger.info(f"Updated setting: {key}")
     return {"success": True}
 
@@ -331,18 +414,30 @@ async def set_setting(key: str, body: Dict[str, Any]):
 # === History Endpoints ===
 
 @app.get("/api/history")
-async def get_history(limit: int = 50):
-    """Get conversation history."""
-    conversations = db.get_conversations(limit)
+async def get_history(limit: int = 50, summary: bool = False):
+    """Get conversation history (summary=true omits config and responses)."""
+    if summary:
+        conversations = await _db(db.get_conversations_summary, limit)
+    else:
+        conversations = await _db(db.get_conversations, limit)
     return {"conversations": conversations}
 
 
+@app.get("/api/history/{conv_id}")
+async def get_history_item(conv_id: str):
+    """Get a single conversation with its responses."""
+    conversation = await _db(db.get_conversation, conv_id)
+    if conversation is None:
+        raise HTTPException(status_code=404, detail="Conversation not found")
+    return conversation
+
+
 @app.post("/api/history")
 async def save_conversation(conv: Dict[str, Any]):
     """Save a conversation."""
     conv_id = conv.get('id') or str(uuid.uuid4())
     conv['id'] = conv_id
-    db.save_conversation(conv)
+    await _db(db.save_conversation, conv)
     logger.info(f"Saved conversation: {conv_id}")
     return {"id": conv_id, "success": True}
 
@@ -350,7 +445,7 @@ async def save_conversation(conv: Dict[str, Any]):
 @app.delete("/api/history/{conv_id}")
 async def delete_history(conv_id: str):
     """Delete a conversation."""
-    db.delete_conversation(conv_id)
+    await _db(db.delete_conversation, conv_id)
     logger.info(f"Deleted conversation: {conv_id}")
     return {"success": True}
 
@@ -358,28 +453,35 @@ async def delete_history(conv_id: str):
 # === Execution Logs Endpoints ===
 
 @app.get("/api/logs/{conv_id}")
-async def get_logs(conv_id: str, round_number: Optional[int] = None):
-    """Get execution logs for a conversation."""
-    logs = db.get_execution_logs(conv_id, round_number)
+async def get_logs(conv_id: str, round_number: Optional[int] = None,
+                   offset: int = 0, limit: Optional[int] = None, summary: bool = False):
+    """Get execution logs for a conversation (all of them unless limit is given)."""
+    logs = await _db(db.get_execution_logs, conv_id, round_number, offset, limit, summary)
     return {"logs": logs}
 
 
 @app.get("/api/logs/{conv_id}/rounds")
 async def get_rounds(conv_id: str):
     """Get all round numbers for a conversation."""
-    rounds = db.get_rounds_for_conversation(conv_id)
+    rounds = await _db(db.get_rounds_for_conversation, conv_id)
     return {"rounds": rounds}
 
 
 @app.get("/api/logs/{conv_id}/decision-tree")
 async def get_decision_tree(conv_id: str, round_number: Optional[int] = None):
     """Get decision tree for a conversation."""
-    tree = db.get_decision_tree(conv_id, round_number)
+    tree = await _db(db.get_decision_tree, conv_id, round_number)
     return {"tree": tree}
 
 
 # === WebSocket Execution ===
 
+# Messages sent within this window go out together as one "batch" frame
+_WS_BATCH_WINDOW = 0.01  # seconds
+# Message types that flush the pending batch (including themselves) right away
+_WS_IMMEDIATE_TYPES = frozenset({"stage_update", "final_answer", "complete", "error"})
+
+
 class CouncilExecutor:
     """Handles council execution with WebSocket streaming and logging."""
 
@@ -390,11 +492,93 @@ class CouncilExecutor:
         self.conversation_id = str(uuid.uuid4())
         self.round_number = 1
         self.parent_node_id = None
+        # node id -> that node's stage 1 response, formatted as upstream context
+        self._context_fragments: Dict[str, str] = {}
+        # Outgoing messages waiting for the next flush
+        self._send_buffer: List[Dict[str, Any]] = []
+        self._send_lock = asyncio.Lock()
+        self._flush_handle: Optional[asyncio.TimerHandle] = None
+        self._flush_task: Optional[asyncio.Task] = None
+        # Set when a frame could not be sent; later sends raise instead of buffering
+        self._send_error: Optional[Exception] = None
 
     async def send(self, msg_type: str, **data):
-        """Send a message through the WebSocket."""
+        """Queue a message for the WebSocket; bursts are coalesced into one frame."""
+        # Buffered sends don't touch the socket, so surface an earlier failed
+        # flush here; the run stops instead of paying for calls nobody sees
+        if self._send_error is not None:
+            raise WebSocketDisconnect(code=1006) from self._send_error
         # Include conversation_id for client-side tracking
-        await self.ws.send_json({"type": msg_type, "conversationId": self.conversation_id, **data})
+        self._send_buffer.append({"type": msg_type, "conversationId": self.conversation_id, **data})
+        if msg_type in _WS_IMMEDIATE_TYPES:
+            await self.flush()
+        elif self._flush_handle is None:
+            self._flush_handle = asyncio.get_running_loop().call_later(_WS_BATCH_WINDOW, self._flush_later)
+
+    def _flush_later(self):
+        """Timer callback: flush the pending batch from a task."""
+        self._flush_handle = None
+        self._flush_task = asyncio.create_task(self.flush())
+        self._flush_task.add_done_callback(self._flush_done)
+
+    def _flush_done(self, task: asyncio.Task):
+        """Log a failed background flush (e.g. the client went away)."""
+        if task is self._flush_task:
+            self._flush_task = None
+        if not task.cancelled() and task.exception() is not None:
+            logger.warning(f"WebSocket flush failed: {task.exception()}")
+
+    async def flush(self):
+        """Send pending messages: a lone message as-is, several as one batch frame."""
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+        # The lock keeps frames in order when a timer flush and an immediate one overlap
+        async with self._send_lock:
+            if not self._send_buffer:
+                return
+            events, self._send_buffer = self._send_buffer, []
+            if len(events) == 1:
+                frame = events[0]
+            else:
+                frame = {"type": "batch", "conversationId": self.conversation_id, "events": events}
+            # Text frame, which the frontend JSON.parses
+            try:
+                await self.ws.send_text(_json_bytes(frame).decode())
+            except Exception as e:
+                self._send_error = e
+                raise
+
+    async def stream_response(self, node_id: str, model: str,
+                              messages: List[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+        """
+        Query a model, forwarding its answer to the client as it is generated.
+
+        The node switches to the "streaming" state on the first chunk, and each
+        chunk is sent as a stream_chunk message.
+
+        Returns:
+            Dict with the full 'content', 'reasoning_details' and 'usage' (like
+            query_model), or None if the stream failed before completing
+        """
+        parts = []
+        # Closed on every exit (early return, failed send) so the HTTP stream
+        # and its pooled connection are released straight away
+        async with aclosing(stream_model(model, messages)) as events:
+            async for event in events:
+                delta = event["delta"]
+                if delta:
+                    if not parts:
+                        await self.send("node_state", nodeId=node_id, state="streaming")
+                    parts.append(delta)
+                    await self.send("stream_chunk", nodeId=node_id, chunk=delta)
+                if event["usage"] is not None:
+                    return {
+                        "content": "".join(parts),
+                        "reasoning_details": event.get("reasoning_details"),
+                        "usage": event["usage"]
+                    }
+        return None
 
     def log_execution(self, stage: str, node_id: str = None, node_name: str = None,
                       model: str = None, role: str = None, input_content: str = None,
@@ -416,33 +600,38 @@ class CouncilExecutor:
             'duration_ms': duration_ms
         })
 
-    def log_decision(self, node_id: str, decision_type: str, decision_data: Dict = None):
-        """Log a decision in the tree."""
+    def log_decision(self, node_id: str, decision_type: str, decision_data: Dict = None,
+                     parent: Optional[str] = None):
+        """
+        Log a decision in the tree.
+
+        Without a parent the decision hangs off the previous one and becomes
+        the parent of the next. Decisions from concurrent tasks pass their
+        stage node as parent instead, so the tree doesn't depend on which
+        task finished first.
+        """
         db.log_decision({
             'conversation_id': self.conversation_id,
             'round_number': self.round_number,
-            'parent_node_id': self.parent_node_id,
+            'parent_node_id': self.parent_node_id if parent is None else parent,
             'node_id': node_id,
             'decision_type': decision_type,
             'decision_data': decision_data or {}
         })
-        self.parent_node_id = node_id
+        if parent is None:
+            self.parent_node_id = node_id
 
     def get_role_prompt(self, role_id: str) -> str:
         """Get the system prompt for a role."""
-        for role in AVAILABLE_ROLES:
-            if role["id"] == role_id:
-                return role["prompt"]
-        return AVAILABLE_ROLES[0]["prompt"]
+        return _ROLE_PROMPTS.get(role_id, _DEFAULT_ROLE_PROMPT)
 
     def calculate_cost(self, model: str, usage: Dict) -> float:
         """Calculate cost for a model response."""
-        if model in MODEL_PRICING:
-            pricing = MODEL_PRICING[model]
-            input_cost = (usage.get('prompt_tokens', 0) / 1_000_000) * pricing['input']
-            output_cost = (usage.get('completion_tokens', 0) / 1_000_000) * pricing['output']
-            return round(input_cost + output_cost, 6)
-        return 0.0
+        prices = MODEL_TOKEN_PRICES.get(model)
+        if prices is None:
+            return 0.0
+        return round(usage.get('prompt_tokens', 0) * prices[0]
+                     + usage.get('completion_tokens', 0) * prices[1], 6)
 
     def build_execution_graph(self, nodes: List[Dict], edges: List[Dict]) -> Dict[str, Any]:
         """
@@ -454,6 +643,9 @@ class CouncilExecutor:
             - incoming: id -> list of source node ids
             - outgoing: id -> list of target node ids
             - execution_order: topologically sorted node ids
+            - execution_layers: execution_order split into layers; a node's
+              upstream nodes are all in earlier layers, so each layer can run
+              concurrently
         """
         node_map = {n["id"]: n for n in nodes}
         incoming = {n["id"]: [] for n in nodes}  # Who sends TO this node
@@ -467,43 +659,53 @@ class CouncilExecutor:
                 outgoing[source].append(target)
                 incoming[target].append(source)
 
-        # Topological sort using Kahn's algorithm
-        in_degree = {n_id: len(incoming[n_id]) for n_id in node_map}
-        queue = [n_id for n_id, degree in in_degree.items() if degree == 0]
-        execution_order = []
-
-        while queue:
-            # Sort queue by speaking order for consistent ordering of parallel nodes
-            queue.sort(key=lambda n_id: node_map[n_id].get("data", {}).get("speakingOrder", 99))
-            current = queue.pop(0)
-            execution_order.append(current)
-
-            for target in outgoing[current]:
-                in_degree[target] -= 1
-                if in_degree[target] == 0:
-                    queue.append(target)
+        def speaking_order(n_id: str) -> int:
+            return node_map[n_id].get("data", {}).get("speakingOrder", 99)
 
-        # If not all nodes are in execution_order, there's a cycle - fall back to speaking order
+        # Topological sort using Kahn's algorithm, one layer at a time: every node
+        # whose in-degree is zero once the previous layer is done forms the next layer
+        in_degree = {n_id: len(incoming[n_id]) for n_id in node_map}
+        layer = [n_id for n_id, degree in in_degree.items() if degree == 0]
+        execution_layers = []
+
+        while layer:
+            # Sort by speaking order for consistent ordering of parallel nodes
+            layer.sort(key=speaking_order)
+            execution_layers.append(layer)
+            next_layer = []
+            for current in layer:
+                for target in outgoing[current]:
+                    in_degree[target] -= 1
+                    if in_degree[target] == 0:
+                        next_layer.append(target)
+            layer = next_layer
+
+        execution_order = [n_id for layer in execution_layers for n_id in layer]
+
+        # If not all nodes are in execution_order, there's a cycle - fall back to
+        # speaking order, one node at a time
         if len(execution_order) != len(nodes):
             logger.warning("Cycle detected in edges, falling back to speaking order")
-            execution_order = sorted(
-                [n["id"] for n in nodes],
-                key=lambda n_id: node_map[n_id].get("data", {}).get("speakingOrder", 99)
-            )
+            execution_order = sorted([n["id"] for n in nodes], key=speaking_order)
+            execution_layers = [[n_id] for n_id in execution_order]
 
         return {
             "node_map": node_map,
             "incoming": incoming,
             "outgoing": outgoing,
-            "execution_order": execution_order
+            "execution_order": execution_order,
+            "execution_layers": execution_layers
         }
 
-    def get_upstream_responses(self, node_id: str, incoming: Dict[str, List[str]],
-                                responses: Dict[str, Dict], node_map: Dict[str, Dict]) -> str:
+    def record_context_fragment(self, node_id: str, display_name: str, content: str):
+        """Format a finished node's response once for the prompts of its downstream nodes."""
+        self._context_fragments[node_id] = f"\n{display_name}'s response:\n{content}\n"
+
+    def get_upstream_responses(self, node_id: str, incoming: Dict[str, List[str]]) -> str:
         """
         Get responses from upstream nodes (nodes that have edges pointing to this node).
 
-        If no edges point to this node, return all available responses.
+        Upstream nodes that produced no response are skipped.
         """
         upstream_ids = incoming.get(node_id, [])
 
@@ -511,16 +713,11 @@ class CouncilExecutor:
         if not upstream_ids:
             return ""
 
-        # Build context from upstream responses only
-        context_parts = []
-        for upstream_id in upstream_ids:
-            if upstream_id in responses:
-                resp = responses[upstream_id]
-                display_name = node_map[upstream_id].get("data", {}).get("displayName", "Unknown")
-                context_parts.append(f"\n{display_name}'s response:\n{resp['content']}\n")
-
-        if context_parts:
-            return "\n\nPrevious responses from connected council members:" + "".join(context_parts)
+        # Build context from the upstream fragments recorded in stage 1
+        fragments = self._context_fragments
+        context = "".join(fragments[u] for u in upstream_ids if u in fragments)
+        if context:
+            return "\n\nPrevious responses from connected council members:" + context
         return ""
 
     async def execute(self, query: str, config: Dict[str, Any]):
@@ -537,6 +734,7 @@ class CouncilExecutor:
         node_map = graph["node_map"]
         incoming = graph["incoming"]
         execution_order = graph["execution_order"]
+        execution_layers = graph["execution_layers"]
 
         # Separate chairman from participants
         participants = [n for n in nodes if not n.get("data", {}).get("isChairman", False)]
@@ -546,6 +744,8 @@ class CouncilExecutor:
 
         # Filter execution order to exclude chairman (handled separately at the end)
         participant_order = [n_id for n_id in execution_order if n_id != chairman_id]
+        participant_layers = [[n_id for n_id in layer if n_id != chairman_id]
+                              for layer in execution_layers]
 
         # Log the edge configuration being used
         logger.info(f"=== COUNCIL EXECUTION ===")
@@ -563,9 +763,10 @@ class CouncilExecutor:
         self.log_decision("stage1", "stage_start", {"stage": "individual_responses", "participants": len(participants)})
 
         stage1_responses = {}
+        self._context_fragments = {}
 
-        # Execute nodes in topological order based on edges
-        for node_id in participant_order:
+        async def _run_participant(node_id: str):
+            """Query one participant with its upstream context and record the response."""
             node = node_map[node_id]
             data = node.get("data", {})
             model = data.get("model", "anthropic/claude-3.5-sonnet")
@@ -583,7 +784,7 @@ class CouncilExecutor:
             pattern_suffix = patterns.get_pattern_suffix(pattern_id)
 
             # Get context from upstream nodes (based on edges)
-            upstream_context = self.get_upstream_responses(node_id, incoming, stage1_responses, node_map)
+            upstream_context = self.get_upstream_responses(node_id, incoming)
 
             # Build the enhanced query with upstream context
             enhanced_query = query + pattern_suffix if pattern_suffix else query
@@ -600,10 +801,10 @@ class CouncilExecutor:
             ]
 
             # Query the model
-            start_time = time.time()
+            start_ns = time.perf_counter_ns()
             try:
-                response = await query_model(model, messages)
-                duration_ms = int((time.time() - start_time) * 1000)
+                response = await self.stream_response(node_id, model, messages)
+                duration_ms = (time.perf_counter_ns() - start_ns) // 1_000_000
 
                 if response:
                     content = response.get("content", "")
@@ -620,6 +821,7 @@ class CouncilExecutor:
                         "tokens": tokens,
                         "cost": cost,
                     }
+                    self.record_context_fragment(node_id, display_name, content)
 
                     # Log the execution
                     self.log_execution(
@@ -638,7 +840,7 @@ class CouncilExecutor:
                     # Log decision
                     self.log_decision(node_id, "response_generated", {
                         "model": model, "role": role, "pattern": pattern_id, "tokens": tokens, "cost": cost
-                    })
+                    }, parent="stage1")
 
                     await self.send("response",
                                   nodeId=node_id,
@@ -661,7 +863,7 @@ class CouncilExecutor:
                     await self.send("error", nodeId=node_id, error="Model failed to respond")
 
             except Exception as e:
-                duration_ms = int((time.time() - start_time) * 1000)
+                duration_ms = (time.perf_counter_ns() - start_ns) // 1_000_000
                 logger.error(f"Error querying {model}: {e}")
                 self.log_execution(
                     stage="stage1_error",
@@ -676,6 +878,20 @@ class CouncilExecutor:
                 await self.send("node_state", nodeId=node_id, state="error")
                 await self.send("error", nodeId=node_id, error=str(e))
 
+        # Execute nodes layer by layer in topological order based on edges; nodes in
+        # the same layer have no edges between them, so they are queried concurrently
+        for layer in participant_layers:
+            results = await asyncio.gather(*[_run_participant(n_id) for n_id in layer],
+                                           return_exceptions=True)
+            for n_id, result in zip(layer, results):
+                if isinstance(result, Exception):
+                    logger.error(f"Stage 1 failed for node {n_id}: {result!r}")
+
+        # Keep responses in execution order rather than completion order, so the
+        # stage 2 labels are stable
+        stage1_responses = {n_id: stage1_responses[n_id] for n_id in participant_order
+                            if n_id in stage1_responses}
+
         # === STAGE 2: Peer evaluation (if more than 1 response) ===
         if len(stage1_responses) > 1:
             await self.send("stage_update", stage=2)
@@ -703,8 +919,12 @@ FINAL RANKING:
 2. Response Y
 ..."""
 
-            # Get rankings from each participant (using edge-based order)
-            for node_id in participant_order:
+            # The ranking request is identical for every participant on the same
+            # model, so concurrent rankers share one call per model (single-flight)
+            ranking_calls: Dict[str, asyncio.Task] = {}
+
+            async def _rank(node_id: str):
+                """Get one participant's ranking of the anonymized responses."""
                 node = node_map[node_id]
                 data = node.get("data", {})
                 model = data.get("model")
@@ -715,16 +935,25 @@ FINAL RANKING:
 
                 messages = [{"role": "user", "content": ranking_prompt}]
 
-                start_time = time.time()
+                call = ranking_calls.get(model)
+                shared = call is not None
+                if not shared:
+                    call = ranking_calls[model] = asyncio.create_task(query_model(model, messages))
+
+                start_ns = time.perf_counter_ns()
                 try:
-                    response = await query_model(model, messages)
-                    duration_ms = int((time.time() - start_time) * 1000)
+                    response = await call
+                    duration_ms = (time.perf_counter_ns() - start_ns) // 1_000_000
 
                     if response:
                         ranking_text = response.get("content", "")
-                        usage = response.get("usage", {})
-                        cost = self.calculate_cost(model, usage)
-                        tokens = usage.get("total_tokens", 0)
+                        if shared:
+                            # Only the participant that made the call is charged for it
+                            tokens, cost = 0, 0.0
+                        else:
+                            usage = response.get("usage", {})
+                            cost = self.calculate_cost(model, usage)
+                            tokens = usage.get("total_tokens", 0)
 
                         self.total_tokens += tokens
                         self.total_cost += cost
@@ -748,8 +977,8 @@ FINAL RANKING:
 
                         # Log decision with rankings
                         self.log_decision(f"{node_id}_ranking", "ranking_provided", {
-                            "rankings": rankings, "response_labels": response_labels
-                        })
+                            "rankings": rankings, "response_labels": response_labels, "shared_call": shared
+                        }, parent="stage2")
 
                         await self.send("ranking",
                                       nodeId=node_id,
@@ -759,7 +988,7 @@ FINAL RANKING:
                     await self.send("node_state", nodeId=node_id, state="complete")
 
                 except Exception as e:
-                    duration_ms = int((time.time() - start_time) * 1000)
+                    duration_ms = (time.perf_counter_ns() - start_ns) // 1_000_000
                     logger.error(f"Error getting ranking from {model}: {e}")
                     self.log_execution(
                         stage="stage2_error",
@@ -772,6 +1001,13 @@ FINAL RANKING:
                         duration_ms=duration_ms
                     )
 
+            # Every participant ranks the same prompt, so all rankings run concurrently
+            results = await asyncio.gather(*[_rank(n_id) for n_id in participant_order],
+                                           return_exceptions=True)
+            for n_id, result in zip(participant_order, results):
+                if isinstance(result, Exception):
+                    logger.error(f"Stage 2 ranking failed for node {n_id}: {result!r}")
+
         # === STAGE 3: Chairman synthesis ===
         if chairman:
             await self.send("stage_update", stage=3)
@@ -809,10 +1045,10 @@ FINAL RANKING:
                 {"role": "user", "content": chairman_input}
             ]
 
-            start_time = time.time()
+            start_ns = time.perf_counter_ns()
             try:
                 response = await query_model(chairman_model, messages)
-                duration_ms = int((time.time() - start_time) * 1000)
+                duration_ms = (time.perf_counter_ns() - start_ns) // 1_000_000
 
                 if response:
                     content = response.get("content", "")
@@ -849,7 +1085,7 @@ FINAL RANKING:
                     await self.send("node_state", nodeId=chairman_id, state="complete")
 
             except Exception as e:
-                duration_ms = int((time.time() - start_time) * 1000)
+                duration_ms = (time.perf_counter_ns() - start_ns) // 1_000_000
                 logger.error(f"Error in chairman synthesis: {e}")
                 self.log_execution(
                     stage="stage3_error",
@@ -871,7 +1107,7 @@ FINAL RANKING:
         })
 
         # Save conversation to database
-        db.save_conversation({
+        await _db(db.save_conversation, {
             'id': self.conversation_id,
             'query': query,
             'config': config,
@@ -888,15 +1124,15 @@ FINAL RANKING:
 
     def parse_ranking(self, text: str) -> List[str]:
         """Parse ranking from model response."""
-        import re
         if "FINAL RANKING:" in text:
             parts = text.split("FINAL RANKING:")
             if len(parts) >= 2:
                 ranking_section = parts[1]
-                matches = re.findall(r'\d+\.\s*Response [A-Z]', ranking_section)
+                matches = _RANKED_LABEL_RE.findall(ranking_section)
                 if matches:
-                    return [re.search(r'Response [A-Z]', m).group() for m in matches]
-        return re.findall(r'Response [A-Z]', text)
+                    # Each match ends with the 10-char "Response X" label
+                    return [m[-10:] for m in matches]
+        return _scan_response_labels(text)
 
 
 @app.websocket("/ws/execute")
@@ -1,13 +1,95 @@
 """OpenRouter API client for making LLM requests."""
 
 import httpx
-from typing import List, Dict, Any, Optional
+import orjson
+from typing import AsyncIterator, List, Dict, Any, Optional, Tuple
 
 try:
     from .config import OPENROUTER_API_KEY, OPENROUTER_API_URL
 except ImportError:
     from config import OPENROUTER_API_KEY, OPENROUTER_API_URL
 
+# HTTP/2 multiplexing needs the optional h2 package
+try:
+    import h2  # noqa: F401
+    HTTP2_AVAILABLE = True
+except ImportError:
+    HTTP2_AVAILABLE = False
+
+# Shared client so connections (and TLS sessions) stay warm across stages
+_client: Optional[httpx.AsyncClient] = None
+
+
+def get_client() -> httpx.AsyncClient:
+    """Get the shared AsyncClient, creating it on first use."""
+    global _client
+    if _client is None or _client.is_closed:
+        _client = httpx.AsyncClient(
+            http2=HTTP2_AVAILABLE,
+            # Keep idle connections past httpx's 5s default so they survive the
+            # gaps between council stages and runs
+            limits=httpx.Limits(max_connections=100, max_keepalive_connections=32,
+                                keepalive_expiry=30.0)
+        )
+    return _client
+
+
+async def close_client() -> None:
+    """Close the shared AsyncClient (e.g. on application shutdown)."""
+    global _client
+    if _client is not None:
+        await _client.aclose()
+        _client = None
+
+
+# Providers that only cache prompt prefixes marked with cache_control
+_EXPLICIT_CACHE_PROVIDERS = ("anthropic/",)
+
+
+def _with_prompt_caching(
+    model: str,
+    messages: List[Dict[str, Any]]
+) -> List[Dict[str, Any]]:
+    """
+    Mark a leading system message as a cacheable prefix where the provider needs it.
+
+    Other providers cache identical prefixes automatically, so their messages
+    are sent unchanged.
+
+    Args:
+        model: OpenRouter model identifier
+        messages: List of message dicts with 'role' and 'content'
+
+    Returns:
+        Messages to send (the caller's list is never modified)
+    """
+    if not model.startswith(_EXPLICIT_CACHE_PROVIDERS) or not messages:
+        return messages
+
+    first = messages[0]
+    if first.get("role") != "system" or not isinstance(first.get("content"), str):
+        return messages
+
+    system = {
+        "role": "system",
+        "content": [{
+            "type": "text",
+            "text": first["content"],
+            "cache_control": {"type": "ephemeral"}
+        }]
+    }
+    return [system, *messages[1:]]
+
+
+def _request_headers() -> Dict[str, str]:
+    """Headers for an OpenRouter API request."""
+    return {
+        "Authorization": f"Bearer {OPENROUTER_API_KEY}",
+        "Content-Type": "application/json",
+        "HTTP-Referer": "https://github.com/yourusername/ai-council",  # Optional but recommended
+        "X-Title": "AI Council",  # Optional but recommended
+    }
+
 
 async def query_model(
     model: str,
@@ -33,16 +115,11 @@ async def query_model(
         logger.error("OpenRouter API key not configured or using test key!")
         return None
 
-    headers = {
-        "Authorization": f"Bearer {OPENROUTER_API_KEY}",
-        "Content-Type": "application/json",
-        "HTTP-Referer": "https://github.com/yourusername/ai-council",  # Optional but recommended
-        "X-Title": "AI Council",  # Optional but recommended
-    }
+    headers = _request_headers()
 
     payload = {
         "model": model,
-        "messages": messages,
+        "messages": _with_prompt_caching(model, messages),
     }
 
     logger.info(f"🚀 Querying {model}...")
@@ -50,36 +127,36 @@ async def query_model(
     logger.debug(f"   Message: {messages[0]['content'][:100]}...")
 
     try:
-        async with httpx.AsyncClient(timeout=timeout) as client:
-            response = await client.post(
-                OPENROUTER_API_URL,
-                headers=headers,
-                json=payload
-            )
+        response = await get_client().post(
+            OPENROUTER_API_URL,
+            headers=headers,
+            json=payload,
+            timeout=timeout
+        )
 
-            logger.debug(f"   Response status: {response.status_code}")
+        logger.debug(f"   Response status: {response.status_code}")
 
-            # Check for errors
-            if response.status_code != 200:
-                error_text = response.text
-                logger.error(f"❌ {model} failed: {response.status_code} - {error_text}")
-                return None
+        # Check for errors
+        if response.status_code != 200:
+            error_text = response.text
+            logger.error(f"❌ {model} failed: {response.status_code} - {error_text}")
+            return None
 
-            response.raise_for_status()
-            data = response.json()
+        response.raise_for_status()
+        data = response.json()
 
-            # Extract message and usage
-            message = data['choices'][0]['message']
-            usage = data.get('usage', {})
+        # Extract message and usage
+        message = data['choices'][0]['message']
+        usage = data.get('usage', {})
 
-            result = {
-                'content': message.get('content'),
-                'reasoning_details': message.get('reasoning_details'),
-                'usage': usage
-            }
+        result = {
+            'content': message.get('content'),
+            'reasoning_details': message.get('reasoning_details'),
+            'usage': usage
+        }
 
-            logger.info(f"✅ {model} responded ({usage.get('total_tokens', 0)} tokens)")
-            return result
+        logger.info(f"✅ {model} responded ({usage.get('total_tokens', 0)} tokens)")
+        return result
 
     except httpx.TimeoutException as e:
         logger.error(f"⏱️ {model} timed out after {timeout}s: {e}")
@@ -97,6 +174,94 @@ async def query_model(
         return None
 
 
+async def stream_model(
+    model: str,
+    messages: List[Dict[str, str]],
+    timeout: float = 120.0
+) -> AsyncIterator[Dict[str, Any]]:
+    """
+    Query a single model via OpenRouter API, yielding the answer as it is generated.
+
+    Args:
+        model: OpenRouter model identifier (e.g., "openai/gpt-4o")
+        messages: List of message dicts with 'role' and 'content'
+        timeout: Request timeout in seconds
+
+    Yields:
+        {'delta': text, 'usage': None} for each content chunk, then one final
+        {'delta': '', 'usage': usage dict, 'reasoning_details': list or None}
+        when the stream completes. Failures, including a stream that ends
+        before [DONE], are logged and end the stream without the final event.
+    """
+    import logging
+    logger = logging.getLogger(__name__)
+
+    # Validate API key
+    if not OPENROUTER_API_KEY or OPENROUTER_API_KEY == "test-key-12345":
+        logger.error("OpenRouter API key not configured or using test key!")
+        return
+
+    payload = {
+        "model": model,
+        "messages": _with_prompt_caching(model, messages),
+        "stream": True,
+        "stream_options": {"include_usage": True},
+    }
+
+    logger.info(f"🚀 Streaming {model}...")
+
+    usage: Dict[str, Any] = {}
+    reasoning_details: List[Dict[str, Any]] = []
+    done = False
+    try:
+        async with get_client().stream(
+            "POST",
+            OPENROUTER_API_URL,
+            headers=_request_headers(),
+            json=payload,
+            timeout=timeout
+        ) as response:
+            if response.status_code != 200:
+                error_text = (await response.aread()).decode(errors="replace")
+                logger.error(f"❌ {model} failed: {response.status_code} - {error_text}")
+                return
+
+            # Server-sent events: "data: {json}" lines, ": comment" keep-alives
+            async for line in response.aiter_lines():
+                if not line.startswith("data: "):
+                    continue
+                data = line[6:]
+                if data == "[DONE]":
+                    done = True
+                    break
+                event = orjson.loads(data)
+                if "error" in event:
+                    logger.error(f"❌ {model} stream error: {event['error']}")
+                    return
+                if event.get("usage"):
+                    usage = event["usage"]
+                for choice in event.get("choices", ()):
+                    delta = choice.get("delta", {})
+                    if delta.get("reasoning_details"):
+                        reasoning_details.extend(delta["reasoning_details"])
+                    if delta.get("content"):
+                        yield {"delta": delta["content"], "usage": None}
+
+    except httpx.TimeoutException as e:
+        logger.error(f"⏱️ {model} timed out after {timeout}s: {e}")
+        return
+    except Exception as e:
+        logger.error(f"❌ {model} unexpected error: {type(e).__name__}: {e}")
+        return
+
+    if not done:
+        logger.error(f"❌ {model} stream ended before [DONE]")
+        return
+
+    logger.info(f"✅ {model} streamed ({usage.get('total_tokens', 0)} tokens)")
+    yield {"delta": "", "usage": usage, "reasoning_details": reasoning_details or None}
+
+
 async def query_models_parallel(
     models: List[str],
     messages: List[Dict[str, str]],
@@ -141,6 +306,39 @@ async def query_models_parallel(
     return result
 
 
+async def query_models_parallel_stream(
+    models: List[str],
+    messages: List[Dict[str, str]],
+    timeout: float = 120.0
+) -> AsyncIterator[Tuple[str, Optional[Dict[str, Any]]]]:
+    """
+    Query multiple models in parallel, yielding each response as it arrives.
+
+    Args:
+        models: List of OpenRouter model identifiers
+        messages: List of message dicts to send to each model
+        timeout: Request timeout in seconds
+
+    Yields:
+        (model identifier, response dict or None if failed) in completion order
+    """
+    import asyncio
+    import logging
+
+    logger = logging.getLogger(__name__)
+    logger.info(f"Streaming {len(models)} models in parallel with timeout {timeout}s")
+
+    async def query_tagged(model: str) -> Tuple[str, Optional[Dict[str, Any]]]:
+        try:
+            return model, await query_model(model, messages, timeout)
+        except Exception as e:
+            logger.error(f"Exception querying {model}: {e}")
+            return model, None
+
+    for next_done in asyncio.as_completed([query_tagged(model) for model in models]):
+        yield await next_done
+
+
 async def fetch_available_models() -> List[Dict[str, Any]]:
     """
     Fetch available models from OpenRouter API.
@@ -154,14 +352,13 @@ async def fetch_available_models() -> List[Dict[str, Any]]:
     models_url = "https://openrouter.ai/api/v1/models"
 
     try:
-        async with httpx.AsyncClient(timeout=30.0) as client:
-            response = await client.get(models_url)
-            response.raise_for_status()
-            data = response.json()
-
-            models = data.get('data', [])
-            logger.info(f"✅ Fetched {len(models)} models from OpenRouter")
-            return models
+        response = await get_client().get(models_url, timeout=30.0)
+        response.raise_for_status()
+        data = response.json()
+
+        models = data.get('data', [])
+        logger.info(f"✅ Fetched {len(models)} models from OpenRouter")
+        return models
 
     except Exception as e:
         logger.error(f"❌ Failed to fetch models from OpenRouter: {e}")
@@ -2,7 +2,7 @@
 
 import asyncio
 import logging
-from typing import Dict, List, Any, Optional
+from typing import Dict, List, Any, Optional, Union
 from .config import FALLBACK_MODELS, MODEL_COSTS
 from .openrouter import query_models_parallel, query_model
 
@@ -226,19 +226,23 @@ class PartialResponseHandler:
 
     @staticmethod
     def can_proceed_with_partial(
-        responses: Dict[str, Any],
+        responses: Union[Dict[str, Any], List[Dict[str, Any]]],
         min_required: int = 2
     ) -> bool:
         """
         Determine if we can proceed with partial responses.
 
         Args:
-            responses: Dictionary of model responses
+            responses: Dictionary of raw model responses, or a list of
+                already-validated Stage 1 results (only counted)
             min_required: Minimum responses needed
 
         Returns:
             True if we can proceed
         """
+        if isinstance(responses, list):
+            return len(responses) >= min_required
+
         valid_responses = sum(
             1 for r in responses.values()
             if r is not None and len(r.get('content', '')) > 10
@@ -101,70 +101,73 @@ export default function App() {
       };
 
       ws.onmessage = (event) => {
-        const msg = JSON.parse(event.data);
-
-        // Capture conversation ID from any message that includes it
-        if (msg.conversationId) {
-          currentConversationId.current = msg.conversationId;
-        }
-
-        switch (msg.type) {
-          case 'stage_update':
-            setStage(msg.stage);
-            break;
-
-          case 'node_state':
-            setNodeState(msg.nodeId, msg.state);
-            break;
-
-          case 'stream_chunk':
-            appendStreamingContent(msg.nodeId, msg.chunk);
-            break;
-
-          case 'response':
-            setResponse(msg.nodeId, {
-              content: msg.content,
-              tokens: msg.tokens,
-              cost: msg.cost,
-            });
-            setNodeState(msg.nodeId, 'complete');
-            break;
-
-          case 'ranking':
-            setRanking(msg.nodeId, {
-              rankings: msg.rankings,
-              reasoning: msg.reasoning,
-            });
-            break;
-
-          case 'final_answer':
-            setFinalAnswer({
-              content: msg.content,
-              tokens: msg.tokens,
-              cost: msg.cost,
-            });
-            break;
-
-          case 'complete':
-            // Save to history with conversation ID from backend
-            addConversation({
-              id: currentConversationId.current,
-              query,
-              config,
-              responses: useExecutionStore.getState().responses,
-              rankings: useExecutionStore.getState().rankings, // Include rankings!
-              finalAnswer: useExecutionStore.getState().finalAnswer,
-              tokens: useExecutionStore.getState().totalTokens,
-              cost: useExecutionStore.getState().totalCost,
-            });
-            completeExecution();
-            ws.close();
-            break;
-
-          case 'error':
-            console.error('Execution error:', msg.error);
-            setNodeState(msg.nodeId, 'error');
-            break;
+        const frame = JSON.parse(event.data);
+        // The backend coalesces bursts of messages into one "batch" frame
+        const messages = frame.type === 'batch' ? frame.events : [frame];
+        for (const msg of messages) {
+          // Capture conversation ID from any message that includes it
+          if (msg.conversationId) {
+            currentConversationId.current = msg.conversationId;
+          }
+
+          switch (msg.type) {
+            case 'stage_update':
+              setStage(msg.stage);
+              break;
+
+            case 'node_state':
+              setNodeState(msg.nodeId, msg.state);
+              break;
+
+            case 'stream_chunk':
+              appendStreamingContent(msg.nodeId, msg.chunk);
+              break;
+
+            case 'response':
+              setResponse(msg.nodeId, {
+                content: msg.content,
+                tokens: msg.tokens,
+                cost: msg.cost,
+              });
+              setNodeState(msg.nodeId, 'complete');
+              break;
+
+            case 'ranking':
+              setRanking(msg.nodeId, {
+                rankings: msg.rankings,
+                reasoning: msg.reasoning,
+              });
+              break;
+
+            case 'final_answer':
+              setFinalAnswer({
+                content: msg.content,
+                tokens: msg.tokens,
+                cost: msg.cost,
+              });
+              break;
+
+            case 'complete':
+              // Save to history with conversation ID from backend
+              addConversation({
+                id: currentConversationId.current,
+                query,
+                config,
+                responses: useExecutionStore.getState().responses,
+                rankings: useExecutionStore.getState().rankings, // Include rankings!
+                finalAnswer: useExecutionStore.getState().finalAnswer,
+                tokens: useExecutionStore.getState().totalTokens,
+                cost: useExecutionStore.getState().totalCost,
+              });
+              completeExecution();
+              ws.close();
+              break;
+
+            case 'error':
+              console.error('Execution error:', msg.error);
+              setNodeState(msg.nodeId, 'error');
+              break;
+          }
         }
       };
 
@@ -47,59 +47,62 @@ export default function TeamChat({ isVisible, onClose }) {
       };
 
       ws.onmessage = (event) => {
-        const msg = JSON.parse(event.data);
-
-        switch (msg.type) {
-          case 'response':
-            responses[msg.nodeId] = {
-              content: msg.content,
-              tokens: msg.tokens,
-            };
-            // Add individual response to chat
-            const node = nodes.find((n) => n.id === msg.nodeId);
-            if (node && !node.data.isChairman) {
+        const frame = JSON.parse(event.data);
+        // The backend coalesces bursts of messages into one "batch" frame
+        const messages = frame.type === 'batch' ? frame.events : [frame];
+        for (const msg of messages) {
+          switch (msg.type) {
+            case 'response':
+              responses[msg.nodeId] = {
+                content: msg.content,
+                tokens: msg.tokens,
+              };
+              // Add individual response to chat
+              const node = nodes.find((n) => n.id === msg.nodeId);
+              if (node && !node.data.isChairman) {
+                setMessages((prev) => [
+                  ...prev,
+                  {
+                    role: 'assistant',
+                    participant: node.data.displayName,
+                    model: node.data.model,
+                    content: msg.content,
+                  },
+                ]);
+              }
+              break;
+
+            case 'final_answer':
+              finalAnswer = msg.content;
               setMessages((prev) => [
                 ...prev,
                 {
-                  role: 'assistant',
-                  participant: node.data.displayName,
-                  model: node.data.model,
+                  role: 'chairman',
                   content: msg.content,
                 },
               ]);
-            }
-            break;
-
-          case 'final_answer':
-            finalAnswer = msg.content;
-            setMessages((prev) => [
-              ...prev,
-              {
-                role: 'chairman',
-                content: msg.content,
-              },
-            ]);
-            break;
-
-          case 'complete':
-            setIsLoading(false);
-            // Save to history
-            addConversation({
-              query: userMessage,
-              config,
-              responses,
-              finalAnswer: { content: finalAnswer },
-            });
-            ws.close();
-            break;
-
-          case 'error':
-            setIsLoading(false);
-            setMessages((prev) => [
-              ...prev,
-              { role: 'error', content: msg.error },
-            ]);
-            break;
+              break;
+
+            case 'complete':
+              setIsLoading(false);
+              // Save to history
+              addConversation({
+                query: userMessage,
+                config,
+                responses,
+                finalAnswer: { content: finalAnswer },
+              });
+              ws.close();
+              break;
+
+            case 'error':
+              setIsLoading(false);
+              setMessages((prev) => [
+                ...prev,
+                { role: 'error', content: msg.error },
+              ]);
+              break;
+          }
         }
       };
 
@@ -103,7 +103,7 @@ def mock_cache():
     cache = ResponseCache()
     # Use in-memory cache for testing
     cache.use_redis = False
-    cache.memory_cache = {}
+    cache.memory_cache.clear()
     return cache
 
 
@@ -6,7 +6,8 @@ from backend.agent_roles import (
     RoleAssigner,
     CouncilComposer,
     get_default_roles,
-    assign_role_to_model
+    assign_role_to_model,
+    get_available_models
 )
 
 
@@ -29,6 +30,27 @@ class TestAgentRole:
         assert role.prompt_modifier
         assert role.priority == 1
 
+    def test_role_is_immutable_and_hashable(self):
+        """Test that roles are frozen value objects usable in sets."""
+        role = get_default_roles()[0]
+
+        with pytest.raises(AttributeError):
+            role.priority = 99
+
+        assert len({role, get_default_roles()[0]}) == 1
+
+    def test_role_to_dict(self):
+        """Test that to_dict includes every field."""
+        role = get_default_roles()[0]
+
+        assert role.to_dict() == {
+            "name": role.name,
+            "display_name": role.display_name,
+            "description": role.description,
+            "prompt_modifier": role.prompt_modifier,
+            "priority": role.priority,
+        }
+
     def test_default_roles_exist(self):
         """Test that default roles are properly defined."""
         roles = get_default_roles()
@@ -102,6 +124,17 @@ class TestRoleAssigner:
         opus_assignment = next(a for a in assignments if "opus" in a["model"])
         assert opus_assignment["role"].name == "primary_responder"
 
+    def test_partial_capability_sort(self):
+        """Test that only the top k models are ranked."""
+        models = ["unknown-1", "anthropic/claude-3-opus", "unknown-2", "openai/gpt-4o"]
+
+        assigner = RoleAssigner()
+
+        assert assigner._sort_by_capability(models, k=2) == [
+            "anthropic/claude-3-opus", "openai/gpt-4o", "unknown-1", "unknown-2"
+        ]
+        assert assigner._sort_by_capability(models, k=2)[:2] == assigner._sort_by_capability(models)[:2]
+
     def test_custom_role_assignment(self):
         """Test assigning specific custom roles."""
         models = ["model-1", "model-2"]
@@ -173,6 +206,14 @@ class TestCouncilComposer:
 
         assert budget_council["estimated_cost"] < premium_council["estimated_cost"]
 
+    def test_available_models_cached_and_immutable(self):
+        """Test that tiered model lists are cached and cannot be mutated."""
+        tiers = get_available_models()
+
+        assert get_available_models() is tiers
+        assert all(isinstance(models, tuple) for models in tiers.values())
+        assert list(tiers["premium"]) == sorted(tiers["premium"])
+
     def test_add_agent_to_existing_council(self):
         """Test dynamically adding an agent to council."""
         composer = CouncilComposer()
@@ -203,6 +244,7 @@ class TestCouncilComposer:
         # Can remove when above minimum
         updated = composer.remove_agent(council, agent_index=2)
         assert len(updated["agents"]) == 4
+        assert updated["roles_summary"] == [a["role"].display_name for a in updated["agents"]]
 
         # Cannot remove when at minimum
         minimal_council = composer.compose(agent_count=2)
@@ -0,0 +1,228 @@
+"""Unit tests for the SQLite persistence layer."""
+
+import sqlite3
+import threading
+import time
+from datetime import datetime
+
+import pytest
+
+from backend import database as db
+
+
+@pytest.fixture
+def database(tmp_path, monkeypatch):
+    """Point the database module at a fresh file for one test."""
+    db.close_connections()
+    monkeypatch.setattr(db, 'DB_PATH', str(tmp_path / 'council.db'))
+    monkeypatch.setattr(db, '_setting_cache', {})
+    monkeypatch.setattr(db, '_favourites_cache', None)
+    # The first call also starts the (process-wide) writer thread
+    db.ensure_initialized()
+    db.init_database()
+    yield db
+    db.close_connections()
+
+
+def _raw_connection():
+    """Open a connection that bypasses the module's pool and caches."""
+    conn = sqlite3.connect(db.DB_PATH)
+    conn.row_factory = sqlite3.Row
+    return conn
+
+
+class TestSettings:
+    """Test typed settings storage."""
+
+    @pytest.mark.parametrize("value", [
+        "text",
+        "",
+        True,
+        False,
+        0,
+        42,
+        -7,
+        3.5,
+        0.1,
+        None,
+        {"nested": [1, 2, {"a": None}]},
+        [1, "two", 3.0],
+    ])
+    def test_round_trip(self, database, value):
+        """Each value reads back equal and with the same type."""
+        database.set_setting("key", value)
+        assert database.get_setting("key", "default") == value
+        assert type(database.get_setting("key")) is type(value)
+
+    @pytest.mark.parametrize("value", ["text", True, 42, 3.5, None, {"a": [1]}])
+    def test_round_trip_from_disk(self, database, value, monkeypatch):
+        """Values decode the same when read from the table, not the cache."""
+        database.set_setting("key", value)
+        monkeypatch.setattr(db, '_setting_cache', {})
+        assert database.get_setting("key", "default") == value
+
+    def test_missing_key_returns_default(self, database):
+        """Unknown keys return the default."""
+        assert database.get_setting("missing", "fallback") == "fallback"
+
+    def test_legacy_rows_without_value_type(self, database):
+        """Rows written before value_type existed still decode."""
+        with _raw_connection() as conn:
+            conn.executemany(
+                'INSERT INTO settings (key, value, value_type) VALUES (?, ?, NULL)',
+                [("json", '{"a": 1}'), ("number", '5'), ("plain", 'not json')],
+            )
+        assert database.get_setting("json") == {"a": 1}
+        assert database.get_setting("number") == 5
+        assert database.get_setting("plain") == "not json"
+
+    def test_cached_value_is_not_shared(self, database):
+        """Mutating a returned value does not change later reads."""
+        database.set_setting("key", {"a": [1]})
+        database.get_setting("key")["a"].append(2)
+        assert database.get_setting("key") == {"a": [1]}
+
+    def test_other_writers_seen_after_ttl(self, database):
+        """Writes from another connection show up once the entry expires."""
+        database.set_setting("key", 1)
+        with _raw_connection() as conn:
+            conn.execute("UPDATE settings SET value = '2' WHERE key = 'key'")
+        assert database.get_setting("key") == 1
+        # Expire the entry rather than waiting out the TTL
+        db._setting_cache["key"] = (0.0, db._setting_cache["key"][1])
+        assert database.get_setting("key") == 2
+
+
+class TestQueuedWrites:
+    """Test execution logs and decisions written by the background writer."""
+
+    def test_flush_makes_writes_visible(self, database):
+        """Queued rows are committed once flush_writes returns."""
+        database.log_executions([
+            {"conversation_id": "c1", "stage": "stage1", "node_id": f"n{i}"}
+            for i in range(5)
+        ])
+        database.log_decision({"conversation_id": "c1", "node_id": "n0"})
+        database.flush_writes()
+        with _raw_connection() as conn:
+            logs = conn.execute('SELECT COUNT(*) FROM execution_logs').fetchone()[0]
+            decisions = conn.execute('SELECT COUNT(*) FROM decision_tree').fetchone()[0]
+        assert logs == 5
+        assert decisions == 1
+
+    def test_flush_ignores_later_writes(self, database, monkeypatch):
+        """flush_writes doesn't wait for writes queued after it was called."""
+        release = threading.Event()
+        write_batch = db._write_batch
+
+        def slow_write_batch(conn, batch):
+            stages = {params[2] for _, params in batch}
+            if "first" in stages:
+                time.sleep(0.2)
+            if "later" in stages:
+                release.wait(5)
+            write_batch(conn, batch)
+
+        monkeypatch.setattr(db, '_write_batch', slow_write_batch)
+        try:
+            database.log_execution({"conversation_id": "c1", "stage": "first"})
+            flusher = threading.Thread(target=database.flush_writes)
+            flusher.start()
+            time.sleep(0.05)
+            database.log_execution({"conversation_id": "c1", "stage": "later"})
+            flusher.join(2)
+            assert not flusher.is_alive()
+        finally:
+            release.set()
+        assert [log["stage"] for log in database.get_execution_logs("c1")] == ["first", "later"]
+
+    def test_readers_see_queued_writes(self, database):
+        """Readers flush first, so a write is visible straight after queueing."""
+        database.log_execution({"conversation_id": "c1", "stage": "stage1", "tokens_used": 7})
+        logs = database.get_execution_logs("c1")
+        assert len(logs) == 1
+        assert logs[0]["tokens_used"] == 7
+
+    def test_unbindable_row_rejects_whole_call(self, database):
+        """A bad row raises to the caller and queues none of its batch."""
+        with pytest.raises(TypeError):
+            database.log_executions([
+                {"conversation_id": "c1", "stage": "stage1"},
+                {"conversation_id": "c1", "stage": object()},
+            ])
+        assert database.get_execution_logs("c1") == []
+
+    def test_pagination_is_stable(self, database):
+        """Pages of rows sharing a timestamp neither repeat nor skip rows."""
+        database.log_executions([
+            {"conversation_id": "c1", "stage": "stage1", "node_id": f"n{i}", "timestamp": 1000}
+            for i in range(10)
+        ])
+        everything = database.get_execution_logs("c1")
+        pages = [
+            database.get_execution_logs("c1", offset=offset, limit=3)
+            for offset in range(0, 10, 3)
+        ]
+        paged = [log for page in pages for log in page]
+        assert [log["id"] for log in paged] == [log["id"] for log in everything]
+        assert len({log["id"] for log in paged}) == 10
+
+    def test_summary_omits_content(self, database):
+        """Summary pages leave out the prompt and output text."""
+        database.log_execution({"conversation_id": "c1", "stage": "stage1", "output_content": "x"})
+        log = database.get_execution_logs("c1", summary=True)[0]
+        assert "output_content" not in log
+
+
+class TestConversations:
+    """Test conversation storage."""
+
+    def test_delete_cascades_to_logs(self, database):
+        """Deleting a conversation removes its logs and decisions."""
+        database.save_conversation({"id": "c1", "query": "q"})
+        database.save_conversation({"id": "c2", "query": "q"})
+        for conv_id in ("c1", "c2"):
+            database.log_execution({"conversation_id": conv_id, "stage": "stage1"})
+            database.log_decision({"conversation_id": conv_id, "node_id": "n"})
+
+        database.delete_conversation("c1")
+
+        assert database.get_conversation("c1") is None
+        assert database.get_execution_logs("c1") == []
+        assert database.get_decision_tree("c1") == []
+        assert len(database.get_execution_logs("c2")) == 1
+        assert len(database.get_decision_tree("c2")) == 1
+
+    def test_json_payloads_round_trip(self, database):
+        """Config and responses read back as the saved structures."""
+        database.save_conversation({
+            "id": "c1", "query": "q", "config": {"nodes": [1]}, "responses": {"a": "b"},
+        })
+        conv = database.get_conversation("c1")
+        assert conv["config"] == {"nodes": [1]}
+        assert conv["responses"] == {"a": "b"}
+        assert database.get_conversations_summary()[0]["id"] == "c1"
+
+
+class TestCachedModels:
+    """Test the model list cache."""
+
+    def test_cache_age_after_caching(self, database):
+        """A fresh cache reports a recent datetime."""
+        database.cache_models([{"id": "m1", "name": "Model 1"}])
+        age = database.get_cache_age()
+        assert isinstance(age, datetime)
+        assert abs((datetime.now() - age).total_seconds()) < 60
+
+    def test_cache_age_on_legacy_text_rows(self, database):
+        """Rows cached with text timestamps read as stale (no age)."""
+        with _raw_connection() as conn:
+            conn.execute(
+                'INSERT INTO cached_models (id, name, cached_at) VALUES (?, ?, ?)',
+                ("m1", "Model 1", "2024-01-01 00:00:00"),
+            )
+        assert database.get_cache_age() is None
+
+    def test_empty_cache_has_no_age(self, database):
+        """No cached models means no cache age."""
+        assert database.get_cache_age() is None
@@ -0,0 +1,114 @@
+"""Unit tests for the OpenRouter streaming client."""
+
+import httpx
+import orjson
+import pytest
+
+from backend import openrouter
+
+
+def _sse(*events):
+    """Encode events as server-sent event lines, with a keep-alive comment."""
+    lines = [": OPENROUTER PROCESSING"]
+    for event in events:
+        lines.append("data: " + (event if isinstance(event, str) else orjson.dumps(event).decode()))
+        lines.append("")
+    return ("\n".join(lines) + "\n").encode()
+
+
+def _chunk(content=None, reasoning_details=None):
+    """A streamed completion chunk carrying one delta."""
+    delta = {}
+    if content is not None:
+        delta["content"] = content
+    if reasoning_details is not None:
+        delta["reasoning_details"] = reasoning_details
+    return {"choices": [{"index": 0, "delta": delta}]}
+
+
+@pytest.fixture
+def stream_body(monkeypatch):
+    """Serve the given SSE body from a mock transport for stream_model."""
+    def serve(body, status_code=200):
+        transport = httpx.MockTransport(lambda request: httpx.Response(status_code, content=body))
+        monkeypatch.setattr(openrouter, "_client", httpx.AsyncClient(transport=transport))
+        monkeypatch.setattr(openrouter, "OPENROUTER_API_KEY", "sk-test")
+    return serve
+
+
+async def _collect(model="openai/gpt-4o"):
+    return [event async for event in openrouter.stream_model(model, [{"role": "user", "content": "Hi"}])]
+
+
+class TestStreamModel:
+    """Test parsing of OpenRouter's server-sent events."""
+
+    @pytest.mark.asyncio
+    async def test_content_chunks_then_usage(self, stream_body):
+        """Each content delta is yielded, then one final usage-only event."""
+        usage = {"prompt_tokens": 3, "completion_tokens": 2, "total_tokens": 5}
+        stream_body(_sse(
+            _chunk("Hel"),
+            _chunk(""),
+            _chunk("lo"),
+            {"choices": [], "usage": usage},
+            "[DONE]",
+        ))
+
+        events = await _collect()
+
+        assert [e["delta"] for e in events] == ["Hel", "lo", ""]
+        assert all(e["usage"] is None for e in events[:-1])
+        assert events[-1]["usage"] == usage
+        assert events[-1]["reasoning_details"] is None
+
+    @pytest.mark.asyncio
+    async def test_reasoning_details_forwarded(self, stream_body):
+        """Reasoning details from the deltas arrive on the final event."""
+        details = [{"type": "reasoning.text", "text": "think"}]
+        stream_body(_sse(
+            _chunk(reasoning_details=details),
+            _chunk("Answer"),
+            {"choices": [], "usage": {"total_tokens": 1}},
+            "[DONE]",
+        ))
+
+        events = await _collect()
+
+        assert [e["delta"] for e in events] == ["Answer", ""]
+        assert events[-1]["reasoning_details"] == details
+
+    @pytest.mark.asyncio
+    async def test_truncated_stream_has_no_final_event(self, stream_body):
+        """A stream cut off before [DONE] yields no completion event."""
+        stream_body(_sse(_chunk("Partial")))
+
+        events = await _collect()
+
+        assert [e["delta"] for e in events] == ["Partial"]
+        assert events[-1]["usage"] is None
+
+    @pytest.mark.asyncio
+    async def test_truncated_json_line_ends_stream(self, stream_body):
+        """A half-written event is treated as a failed stream."""
+        stream_body(_sse(_chunk("Partial")) + b'data: {"choices": [{"delta": {"cont')
+
+        events = await _collect()
+
+        assert [e["delta"] for e in events] == ["Partial"]
+
+    @pytest.mark.asyncio
+    async def test_error_event_ends_stream(self, stream_body):
+        """An in-stream error event ends the stream without completing."""
+        stream_body(_sse(_chunk("Par"), {"error": {"message": "overloaded"}}, "[DONE]"))
+
+        events = await _collect()
+
+        assert [e["delta"] for e in events] == ["Par"]
+
+    @pytest.mark.asyncio
+    async def test_http_error_yields_nothing(self, stream_body):
+        """A non-200 response yields no events."""
+        stream_body(b'{"error": "bad request"}', status_code=400)
+
+        assert await _collect() == []
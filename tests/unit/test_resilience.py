@@ -164,6 +164,11 @@ class TestPartialResponseHandler:
         # Cannot proceed if we need 3
         assert not PartialResponseHandler.can_proceed_with_partial(responses, min_required=3)
 
+        # Already-validated Stage 1 results are simply counted
+        stage1_results = [{"model": "model1"}, {"model": "model2"}]
+        assert PartialResponseHandler.can_proceed_with_partial(stage1_results, min_required=2)
+        assert not PartialResponseHandler.can_proceed_with_partial(stage1_results, min_required=3)
+
     def test_adjust_stage2_for_partial_responses(self):
         """Test Stage 2 adjustment for partial Stage 1 results."""
         # With enough responses